@@ -4,19 +4,23 @@
 import re
 from pathlib import Path
 
+_NON_ALNUM = re.compile(r"[^a-z0-9-]")
+_MULTI_HYPHEN = re.compile(r"-+")
+_BULLET_PREFIX = re.compile(r"^[\s•\t]+")
+
+# "&" maps to a hyphen; surrounding spaces collapse with it below
+_SLUG_CHARS = str.maketrans({"&": "-", "'": "", ".": "", "$": "s"})
+
+# Escape quotes in names for the generated string literals
+_QUOTE_ESCAPE = str.maketrans({'"': '\\"'})
+
 
 def to_slug(name: str) -> str:
     """Convert artist name to nonstop2k filename slug format."""
-    slug = name.lower()
-    # Handle & and special chars
-    slug = slug.replace(" & ", "-")
-    slug = slug.replace("&", "-")
-    slug = slug.replace("'", "")
-    slug = slug.replace(".", "")
-    slug = slug.replace("$", "s")
+    slug = name.lower().translate(_SLUG_CHARS)
     # Replace spaces and non-alphanumeric with hyphens
-    slug = re.sub(r"[^a-z0-9-]", "-", slug)
-    slug = re.sub(r"-+", "-", slug)
+    slug = _NON_ALNUM.sub("-", slug)
+    slug = _MULTI_HYPHEN.sub("-", slug)
     slug = slug.strip("-")
     return slug
 
@@ -24,14 +28,13 @@ def to_slug(name: str) -> str:
 def main():
     # Read artists.txt
     artists_file = Path(__file__).parent.parent / "artists.txt"
-    with open(artists_file) as f:
-        content = f.read()
+    content = artists_file.read_text()
 
     # Parse artist names
     artists = []
     for line in content.split("\n"):
         # Remove bullet point prefix
-        line = re.sub(r"^[\s•\t]+", "", line).strip()
+        line = _BULLET_PREFIX.sub("", line).strip()
         if line:
             artists.append(line)
 
@@ -51,20 +54,20 @@ def main():
     # Generate Python data file
     output_file = Path(__file__).parent.parent / "src" / "midi_analyzer" / "ingest" / "nonstop2k_artists.py"
     
-    with open(output_file, "w") as f:
-        f.write('"""Known nonstop2k.com artist names for metadata extraction.\n\n')
-        f.write("Auto-generated from artists.txt - do not edit manually.\n")
-        f.write('"""\n\n')
-        f.write("# Mapping from filename slug to display name\n")
-        f.write("NONSTOP2K_ARTISTS: dict[str, str] = {\n")
-        
-        for slug in sorted(slug_to_name.keys()):
-            name = slug_to_name[slug]
-            # Escape quotes in names
-            escaped_name = name.replace('"', '\\"')
-            f.write(f'    "{slug}": "{escaped_name}",\n')
-        
-        f.write("}\n")
+    lines = [
+        '"""Known nonstop2k.com artist names for metadata extraction.\n\n',
+        "Auto-generated from artists.txt - do not edit manually.\n",
+        '"""\n\n',
+        "# Mapping from filename slug to display name\n",
+        "NONSTOP2K_ARTISTS: dict[str, str] = {\n",
+    ]
+    lines.extend(
+        f'    "{slug}": "{slug_to_name[slug].translate(_QUOTE_ESCAPE)}",\n'
+        for slug in sorted(slug_to_name)
+    )
+    lines.append("}\n")
+
+    output_file.write_text("".join(lines))
 
     print(f"Wrote {output_file}")
 
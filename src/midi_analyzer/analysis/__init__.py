@@ -1,22 +1,73 @@
-"""Track and song analysis modules."""
-
-from midi_analyzer.analysis.arpeggios import (
-    ArpAnalysis,
-    ArpAnalyzer,
-    ArpWindow,
-    analyze_arp_track,
-    extract_arp_patterns,
-)
-from midi_analyzer.analysis.features import FeatureExtractor
-from midi_analyzer.analysis.roles import RoleClassifier, classify_track_role
-from midi_analyzer.analysis.sections import (
-    BarFeatures,
-    Section,
-    SectionAnalysis,
-    SectionAnalyzer,
-    SectionType,
-    analyze_sections,
-)
+"""Track and song analysis modules.
+
+Submodules are imported on first attribute access (PEP 562), so importing
+one analyzer does not pull in the others.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from midi_analyzer.analysis.arpeggios import (
+        ArpAnalysis,
+        ArpAnalyzer,
+        ArpWindow,
+        analyze_arp_track,
+        extract_arp_patterns,
+    )
+    from midi_analyzer.analysis.features import FeatureExtractor
+    from midi_analyzer.analysis.roles import (
+        RoleClassifier,
+        classify_track_role,
+        classify_track_roles,
+    )
+    from midi_analyzer.analysis.sections import (
+        BarFeatures,
+        Section,
+        SectionAnalysis,
+        SectionAnalyzer,
+        SectionType,
+        analyze_sections,
+    )
+
+# Public name -> submodule that defines it
+_LAZY_IMPORTS: dict[str, str] = {
+    "FeatureExtractor": "features",
+    "RoleClassifier": "roles",
+    "classify_track_role": "roles",
+    "classify_track_roles": "roles",
+    "ArpAnalyzer": "arpeggios",
+    "ArpAnalysis": "arpeggios",
+    "ArpWindow": "arpeggios",
+    "analyze_arp_track": "arpeggios",
+    "extract_arp_patterns": "arpeggios",
+    "SectionAnalyzer": "sections",
+    "SectionAnalysis": "sections",
+    "Section": "sections",
+    "SectionType": "sections",
+    "BarFeatures": "sections",
+    "analyze_sections": "sections",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule defining ``name`` and cache the attribute."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    module = importlib.import_module(f"{__name__}.{module_name}")
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """List module attributes including the lazily imported names."""
+    return sorted(set(globals()) | set(__all__))
+
 
 __all__ = [
     # Features
@@ -24,6 +75,7 @@ __all__ = [
     # Roles
     "RoleClassifier",
     "classify_track_role",
+    "classify_track_roles",
     # Arpeggios (Stage 6)
     "ArpAnalyzer",
     "ArpAnalysis",
@@ -9,21 +9,82 @@ Analyzes tracks with high arp probability to extract:
 
 from __future__ import annotations
 
+import bisect
+import functools
+from collections import Counter
 from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
-from midi_analyzer.harmony.chords import (
-    CHORD_TEMPLATES,
-    Chord,
-    ChordQuality,
-)
+import numpy as np
+
+from midi_analyzer.harmony.chords import CHORD_TEMPLATE_BITS, Chord, ChordQuality
 from midi_analyzer.models.patterns import ArpPattern
 
 if TYPE_CHECKING:
     from midi_analyzer.models.core import NoteEvent, Song, Track
 
 
-@dataclass
+def _infer_chord_from_bits(pc_bits: int) -> Chord | None:
+    """Infer the most likely chord from a 12-bit pitch class mask.
+
+    Args:
+        pc_bits: Pitch class mask (bit n set = pitch class n present).
+
+    Returns:
+        Best matching chord or None.
+    """
+    best = _best_chord_match(pc_bits)
+    if best is None:
+        return None
+
+    root, quality, confidence = best
+    return Chord(root=root, quality=quality, confidence=confidence)
+
+
+@functools.lru_cache(maxsize=4096)
+def _best_chord_match(pc_bits: int) -> tuple[int, ChordQuality, float] | None:
+    """Find the best chord template match for a pitch class mask.
+
+    Results are cached per mask as immutable tuples; callers get a fresh
+    Chord from _infer_chord_from_bits.
+
+    Args:
+        pc_bits: Pitch class mask (bit n set = pitch class n present).
+
+    Returns:
+        Tuple of (root, quality, confidence), or None if nothing matches.
+    """
+    if pc_bits.bit_count() < 3:
+        return None
+
+    best: tuple[int, ChordQuality, float] | None = None
+    best_score = 0.0
+
+    # Try each pitch class as potential root
+    for root in range(12):
+        # Transpose pitch classes relative to this root (rotate the mask)
+        transposed = ((pc_bits >> root) | (pc_bits << (12 - root))) & 0xFFF
+
+        # Check against chord templates
+        for quality, template_bits, template_size in CHORD_TEMPLATE_BITS:
+            # Score = how many template notes are present / template size
+            matches = (transposed & template_bits).bit_count()
+            coverage = matches / template_size
+
+            # Penalize extra notes not in template
+            extras = (transposed & ~template_bits).bit_count()
+            penalty = extras * 0.1
+
+            score = coverage - penalty
+
+            if score > best_score:
+                best_score = score
+                best = (root, quality, min(1.0, score))
+
+    return best
+
+
+@dataclass(slots=True)
 class ArpWindow:
     """A window of notes analyzed as an arpeggio.
 
@@ -46,9 +107,11 @@ class ArpWindow:
     octave_jumps: list[int] = field(default_factory=list)
     avg_note_duration: float = 0.0
     rate: str = "1/16"
+    # Gate (duration / onset spacing), cached by ArpAnalyzer._analyze_window
+    _gate: float | None = field(default=None, init=False, repr=False)
 
 
-@dataclass
+@dataclass(slots=True)
 class ArpAnalysis:
     """Result of arpeggio analysis on a track.
 
@@ -90,6 +153,10 @@ class ArpAnalyzer:
         (1.0, "1/4"),      # Quarter notes
     ]
 
+    # Upper delta bound per rate (25% tolerance), with "1/4" for slower arps
+    _RATE_BOUNDS = [threshold * 1.25 for threshold, _ in RATE_THRESHOLDS]
+    _RATE_LABELS = [rate for _, rate in RATE_THRESHOLDS] + ["1/4"]
+
     def __init__(
         self,
         window_beats: float = DEFAULT_WINDOW_BEATS,
@@ -127,15 +194,11 @@ class ArpAnalyzer:
             first_ts = song.time_sig_map[0]
             window_beats = first_ts.beats_per_bar
 
-        # Divide into windows
-        windows = self._create_windows(notes, window_beats)
+        # Divide into windows with enough notes for arp detection
+        windows = self._create_windows(notes, window_beats, self.min_notes_per_window)
 
         # Analyze each window
-        analyzed_windows: list[ArpWindow] = []
-        for window in windows:
-            if len(window.notes) >= self.min_notes_per_window:
-                analyzed = self._analyze_window(window)
-                analyzed_windows.append(analyzed)
+        analyzed_windows = [self._analyze_window(window) for window in windows]
 
         # Extract dominant patterns
         analysis = self._compile_analysis(track.track_id, analyzed_windows)
@@ -146,40 +209,42 @@ class ArpAnalyzer:
         self,
         notes: list[NoteEvent],
         window_beats: float,
+        min_notes: int = 1,
     ) -> list[ArpWindow]:
         """Divide notes into analysis windows.
 
         Args:
             notes: Sorted list of notes.
             window_beats: Window size in beats.
+            min_notes: Windows with fewer notes than this are skipped.
 
         Returns:
-            List of ArpWindow objects.
+            List of ArpWindow objects. Each window's notes keep the input
+            order, so they are sorted by start beat.
         """
         if not notes:
             return []
 
         windows: list[ArpWindow] = []
         start_beat = notes[0].start_beat
+        note_count = len(notes)
+        i = 0
 
-        # Find end of track
-        end_beat = max(n.start_beat + n.duration_beats for n in notes)
-
-        while start_beat < end_beat:
+        # Single pass: each window takes the run of notes starting before its end
+        while i < note_count:
             window_end = start_beat + window_beats
 
-            # Collect notes in this window
-            window_notes = [
-                n for n in notes
-                if start_beat <= n.start_beat < window_end
-            ]
+            j = i
+            while j < note_count and notes[j].start_beat < window_end:
+                j += 1
 
-            if window_notes:
+            if j > i and j - i >= min_notes:
                 windows.append(ArpWindow(
                     start_beat=start_beat,
                     end_beat=window_end,
-                    notes=window_notes,
+                    notes=notes[i:j],
                 ))
+            i = j
 
             start_beat = window_end
 
@@ -194,89 +259,37 @@ class ArpAnalyzer:
         Returns:
             Window with analysis filled in.
         """
-        notes = sorted(window.notes, key=lambda n: n.start_beat)
+        notes = window.notes
+
+        # Split pitches into octave and pitch class once for the window
+        pitches = np.fromiter((n.pitch for n in notes), dtype=np.int16, count=len(notes))
+        octaves, pitch_classes = np.divmod(pitches, 12)
 
-        # Infer underlying chord from pitch classes
-        pitch_classes = {n.pitch % 12 for n in notes}
-        window.inferred_chord = self._infer_chord(pitch_classes)
+        # Infer underlying chord from the window's pitch class mask
+        pc_bits = int(np.bitwise_or.reduce(np.left_shift(1, pitch_classes)))
+        window.inferred_chord = _infer_chord_from_bits(pc_bits)
 
         # Extract interval sequence relative to chord root
         if window.inferred_chord:
             root = window.inferred_chord.root
-            base_octave = min(n.pitch for n in notes) // 12
-
-            intervals: list[int] = []
-            octave_jumps: list[int] = []
 
-            for note in notes:
-                # Interval from root (within octave)
-                interval = (note.pitch - root) % 12
-                intervals.append(interval)
-
-                # Octave relative to base
-                note_octave = note.pitch // 12
-                octave_jumps.append(note_octave - base_octave)
-
-            window.interval_sequence = intervals
-            window.octave_jumps = octave_jumps
+            # Interval from root (within octave), octave relative to base
+            window.interval_sequence = ((pitches - root) % 12).tolist()
+            window.octave_jumps = (octaves - octaves.min()).tolist()
 
         # Calculate note rate
         if len(notes) >= 2:
-            # Average time between consecutive notes
-            deltas = [
-                notes[i + 1].start_beat - notes[i].start_beat
-                for i in range(len(notes) - 1)
-            ]
-            avg_delta = sum(deltas) / len(deltas) if deltas else 0.5
+            # Average time between consecutive notes (the deltas telescope)
+            avg_delta = (notes[-1].start_beat - notes[0].start_beat) / (len(notes) - 1)
             window.rate = self._delta_to_rate(avg_delta)
 
             # Average duration for gate calculation
             window.avg_note_duration = sum(n.duration_beats for n in notes) / len(notes)
+            if window.avg_note_duration > 0 and avg_delta > 0:
+                window._gate = min(1.0, window.avg_note_duration / avg_delta)
 
         return window
 
-    def _infer_chord(self, pitch_classes: set[int]) -> Chord | None:
-        """Infer the most likely chord from a set of pitch classes.
-
-        Args:
-            pitch_classes: Set of pitch classes (0-11).
-
-        Returns:
-            Best matching chord or None.
-        """
-        if len(pitch_classes) < 3:
-            return None
-
-        best_chord: Chord | None = None
-        best_score = 0.0
-
-        # Try each pitch class as potential root
-        for root in range(12):
-            # Transpose pitch classes relative to this root
-            transposed = frozenset((pc - root) % 12 for pc in pitch_classes)
-
-            # Check against chord templates
-            for quality, template in CHORD_TEMPLATES.items():
-                # Score = how many template notes are present / template size
-                matches = len(transposed & template)
-                coverage = matches / len(template)
-
-                # Penalize extra notes not in template
-                extras = len(transposed - template)
-                penalty = extras * 0.1
-
-                score = coverage - penalty
-
-                if score > best_score:
-                    best_score = score
-                    best_chord = Chord(
-                        root=root,
-                        quality=quality,
-                        confidence=min(1.0, score),
-                    )
-
-        return best_chord
-
     def _delta_to_rate(self, delta_beats: float) -> str:
         """Convert average note delta to rate string.
 
@@ -286,11 +299,7 @@ class ArpAnalyzer:
         Returns:
             Rate string like "1/16".
         """
-        for threshold, rate in self.RATE_THRESHOLDS:
-            if delta_beats <= threshold * 1.25:  # Allow 25% tolerance
-                return rate
-
-        return "1/4"  # Default to quarter notes for slow arps
+        return self._RATE_LABELS[bisect.bisect_left(self._RATE_BOUNDS, delta_beats)]
 
     def _compile_analysis(
         self,
@@ -310,41 +319,24 @@ class ArpAnalyzer:
             return ArpAnalysis(track_id=track_id)
 
         # Find most common rate
-        rate_counts: dict[str, int] = {}
-        for w in windows:
-            rate_counts[w.rate] = rate_counts.get(w.rate, 0) + 1
-        dominant_rate = max(rate_counts, key=rate_counts.get)  # type: ignore[arg-type]
+        rate_counts = Counter(w.rate for w in windows)
+        dominant_rate = rate_counts.most_common(1)[0][0]
 
         # Find most common interval pattern (by first N intervals)
-        pattern_counts: dict[tuple[int, ...], int] = {}
-        for w in windows:
-            if len(w.interval_sequence) >= 4:
-                # Use first 4-8 intervals as pattern signature
-                pattern_len = min(8, len(w.interval_sequence))
-                pattern = tuple(w.interval_sequence[:pattern_len])
-                pattern_counts[pattern] = pattern_counts.get(pattern, 0) + 1
+        # Use first 4-8 intervals as pattern signature
+        pattern_counts = Counter(
+            tuple(w.interval_sequence[:8])
+            for w in windows
+            if len(w.interval_sequence) >= 4
+        )
 
         dominant_pattern: list[int] = []
         if pattern_counts:
-            dominant_pattern = list(max(pattern_counts, key=pattern_counts.get))  # type: ignore[arg-type]
+            dominant_pattern = list(pattern_counts.most_common(1)[0][0])
 
         # Calculate average gate (note duration / note spacing)
-        total_gate = 0.0
-        gate_count = 0
-        for w in windows:
-            if w.avg_note_duration > 0 and len(w.notes) >= 2:
-                notes = sorted(w.notes, key=lambda n: n.start_beat)
-                deltas = [
-                    notes[i + 1].start_beat - notes[i].start_beat
-                    for i in range(len(notes) - 1)
-                ]
-                avg_delta = sum(deltas) / len(deltas) if deltas else 1.0
-                if avg_delta > 0:
-                    gate = min(1.0, w.avg_note_duration / avg_delta)
-                    total_gate += gate
-                    gate_count += 1
-
-        avg_gate = total_gate / gate_count if gate_count > 0 else 0.5
+        gates = [w._gate for w in windows if w._gate is not None]
+        avg_gate = sum(gates) / len(gates) if gates else 0.5
 
         # Extract reusable patterns
         patterns = self._extract_patterns(windows, dominant_rate)
@@ -389,16 +381,7 @@ class ArpAnalyzer:
             seen_patterns.add(pattern_key)
 
             # Calculate gate for this pattern
-            gate = 0.5
-            if window.avg_note_duration > 0 and len(window.notes) >= 2:
-                notes = sorted(window.notes, key=lambda n: n.start_beat)
-                deltas = [
-                    notes[i + 1].start_beat - notes[i].start_beat
-                    for i in range(len(notes) - 1)
-                ]
-                avg_delta = sum(deltas) / len(deltas) if deltas else 1.0
-                if avg_delta > 0:
-                    gate = min(1.0, window.avg_note_duration / avg_delta)
+            gate = window._gate if window._gate is not None else 0.5
 
             patterns.append(ArpPattern(
                 rate=window.rate or dominant_rate,
@@ -6,7 +6,9 @@ import math
 from collections import Counter
 from typing import TYPE_CHECKING
 
-from midi_analyzer.models.core import NoteEvent, Track, TrackFeatures
+import numpy as np
+
+from midi_analyzer.models.core import Track, TrackFeatures
 
 if TYPE_CHECKING:
     pass
@@ -34,33 +36,34 @@ class FeatureExtractor:
         note_count = len(notes)
         note_density = note_count / max(total_bars, 1)
 
+        arrays = track.note_arrays
+
         # Pitch statistics
-        pitches = [n.pitch for n in notes]
-        pitch_min = min(pitches)
-        pitch_max = max(pitches)
+        pitches = arrays["pitch"]
+        pitch_min = int(pitches.min())
+        pitch_max = int(pitches.max())
         pitch_range = pitch_max - pitch_min
-        pitch_median = self._median(pitches)
+        pitch_median = float(np.median(pitches))
 
         # Velocity statistics
-        velocities = [n.velocity for n in notes]
-        avg_velocity = sum(velocities) / len(velocities)
+        avg_velocity = float(arrays["velocity"].mean())
 
         # Duration statistics
-        durations = [n.duration_beats for n in notes]
-        avg_duration = sum(durations) / len(durations)
+        avg_duration = float(arrays["duration_beats"].mean())
 
         # Polyphony analysis
-        polyphony_ratio = self._calculate_polyphony_ratio(notes)
+        polyphony_ratio = self._calculate_polyphony_ratio(
+            arrays["start_beat"], arrays["duration_beats"]
+        )
 
         # Rhythmic complexity
-        syncopation_score = self._calculate_syncopation(notes)
+        syncopation_score = self._calculate_syncopation(arrays["start_beat"])
 
         # Repetition analysis
-        repetition_score = self._calculate_repetition_score(notes)
+        repetition_score = self._calculate_repetition_score(arrays["bar"], pitches)
 
         # Drum track indicators
-        channels = [n.channel for n in notes]
-        is_channel_10 = 9 in channels  # MIDI channel 10 (0-indexed as 9)
+        is_channel_10 = bool((arrays["channel"] == 9).any())  # MIDI channel 10 (0-indexed as 9)
 
         # Pitch class entropy (for drum detection)
         pitch_class_entropy = self._calculate_pitch_class_entropy(pitches)
@@ -81,96 +84,67 @@ class FeatureExtractor:
             pitch_class_entropy=pitch_class_entropy,
         )
 
-    def _median(self, values: list[int | float]) -> float:
-        """Calculate median of a list of values."""
-        sorted_values = sorted(values)
-        n = len(sorted_values)
-        if n == 0:
-            return 0.0
-        if n % 2 == 1:
-            return float(sorted_values[n // 2])
-        return (sorted_values[n // 2 - 1] + sorted_values[n // 2]) / 2
-
-    def _calculate_polyphony_ratio(self, notes: list[NoteEvent]) -> float:
+    def _calculate_polyphony_ratio(self, starts: np.ndarray, durations: np.ndarray) -> float:
         """Calculate the ratio of overlapping notes (polyphony).
 
+        Sweeps over note on/off events and measures the fraction of sounding
+        time during which more than one note is held.
+
         Returns a value between 0 (monophonic) and 1 (highly polyphonic).
         """
-        if len(notes) < 2:
+        count = len(starts)
+        if count < 2:
             return 0.0
 
-        # Sort by start time
-        sorted_notes = sorted(notes, key=lambda n: n.start_beat)
-
-        overlap_count = 0
-        total_comparisons = 0
-
-        for i, note in enumerate(sorted_notes[:-1]):
-            note_end = note.start_beat + note.duration_beats
+        times = np.concatenate([starts, starts + durations])
+        steps = np.concatenate([np.ones(count, np.int32), -np.ones(count, np.int32)])
 
-            # Check for overlap with subsequent notes
-            for next_note in sorted_notes[i + 1 :]:
-                if next_note.start_beat >= note_end:
-                    break  # No more overlaps possible
+        # Order by time, with note-offs before note-ons at the same instant
+        order = np.lexsort((steps, times))
+        times = times[order]
+        polyphony = np.cumsum(steps[order])[:-1]
+        spans = np.diff(times)
 
-                overlap_count += 1
-                total_comparisons += 1
-
-                # Limit comparisons for performance
-                if total_comparisons >= 1000:
-                    break
-
-            if total_comparisons >= 1000:
-                break
-
-        if total_comparisons == 0:
+        sounding = spans[polyphony > 0].sum()
+        if sounding <= 0:
             return 0.0
 
-        return min(1.0, overlap_count / total_comparisons)
+        return min(1.0, float(spans[polyphony > 1].sum() / sounding))
 
-    def _calculate_syncopation(self, notes: list[NoteEvent]) -> float:
+    def _calculate_syncopation(self, starts: np.ndarray) -> float:
         """Calculate syncopation score based on off-beat note placement.
 
         Higher values indicate more syncopated rhythms.
         """
-        if not notes:
+        if len(starts) == 0:
             return 0.0
 
-        off_beat_count = 0
-        for note in notes:
-            # Get position within the beat (0.0 = on beat, 0.5 = off beat)
-            beat_position = note.start_beat % 1.0
+        # Get position within the beat (0.0 = on beat, 0.5 = off beat)
+        beat_position = starts % 1.0
 
-            # Consider positions away from strong beats as syncopated
-            # Strong beats: 0.0 (downbeat), potentially 0.5 (backbeat)
-            if 0.1 < beat_position < 0.4 or 0.6 < beat_position < 0.9:
-                off_beat_count += 1
+        # Consider positions away from strong beats as syncopated
+        # Strong beats: 0.0 (downbeat), potentially 0.5 (backbeat)
+        off_beat = ((beat_position > 0.1) & (beat_position < 0.4)) | (
+            (beat_position > 0.6) & (beat_position < 0.9)
+        )
 
-        return off_beat_count / len(notes)
+        return float(np.count_nonzero(off_beat)) / len(starts)
 
-    def _calculate_repetition_score(self, notes: list[NoteEvent], window_beats: float = 4.0) -> float:
+    def _calculate_repetition_score(self, bars: np.ndarray, pitches: np.ndarray) -> float:
         """Calculate repetition score based on recurring pitch patterns.
 
         Higher values indicate more repetitive patterns.
         """
-        if len(notes) < 8:
+        if len(pitches) < 8:
             return 0.0
 
-        # Create pitch sequences for each bar
-        bar_patterns: list[tuple[int, ...]] = []
-
-        # Group notes by bar
-        notes_by_bar: dict[int, list[int]] = {}
-        for note in notes:
-            bar = note.bar
-            if bar not in notes_by_bar:
-                notes_by_bar[bar] = []
-            notes_by_bar[bar].append(note.pitch)
+        # Group pitches by bar, keeping note order within each bar
+        order = np.argsort(bars, kind="stable")
+        boundaries = np.flatnonzero(np.diff(bars[order])) + 1
+        groups = np.split(pitches[order], boundaries)
 
         # Create pattern tuples for each bar
-        for bar in sorted(notes_by_bar.keys()):
-            pitches = tuple(notes_by_bar[bar])
-            bar_patterns.append(pitches)
+        bar_patterns = [tuple(group.tolist()) for group in groups]
 
         if len(bar_patterns) < 2:
             return 0.0
@@ -181,28 +155,21 @@ class FeatureExtractor:
 
         return repeated_patterns / len(bar_patterns)
 
-    def _calculate_pitch_class_entropy(self, pitches: list[int]) -> float:
+    def _calculate_pitch_class_entropy(self, pitches: np.ndarray) -> float:
         """Calculate entropy of pitch class distribution.
 
         Low entropy suggests drum track (few distinct pitch classes used repeatedly).
         High entropy suggests melodic content.
         """
-        if not pitches:
+        if len(pitches) == 0:
             return 0.0
 
-        # Convert to pitch classes (0-11)
-        pitch_classes = [p % 12 for p in pitches]
-
-        # Count occurrences
-        counts = Counter(pitch_classes)
-        total = len(pitch_classes)
+        # Count occurrences of each pitch class (0-11)
+        counts = np.bincount(pitches % 12, minlength=12)
 
-        # Calculate entropy
-        entropy = 0.0
-        for count in counts.values():
-            if count > 0:
-                p = count / total
-                entropy -= p * math.log2(p)
+        # Calculate entropy over the pitch classes that occur
+        probs = counts[counts > 0] / len(pitches)
+        entropy = float(-(probs * np.log2(probs)).sum())
 
         # Normalize by max possible entropy (log2(12) for 12 pitch classes)
         max_entropy = math.log2(12)
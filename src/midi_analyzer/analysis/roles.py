@@ -2,8 +2,27 @@
 
 from __future__ import annotations
 
+import functools
+from typing import Any
+
+import numpy as np
+
 from midi_analyzer.models.core import RoleProbabilities, Track, TrackFeatures, TrackRole
 
+# TrackFeatures fields used for scoring, in feature-matrix column order
+FEATURE_COLUMNS = (
+    "is_channel_10",
+    "note_density",
+    "avg_duration",
+    "pitch_class_entropy",
+    "pitch_range",
+    "pitch_median",
+    "pitch_max",
+    "polyphony_ratio",
+    "syncopation_score",
+    "repetition_score",
+)
+
 
 class RoleClassifier:
     """Classify track roles based on extracted features.
@@ -31,6 +50,57 @@ class RoleClassifier:
     HIGH_REPETITION = 0.3
     WIDE_RANGE = 24         # Two octaves
 
+    # Score added per role when a condition holds; conditions are computed
+    # in _conditions()
+    ROLE_RULES: dict[str, dict[str, float]] = {
+        "drums": {
+            "drum_channel": 3.0,  # Strong indicator: MIDI channel 10
+            "high_density": 1.0,
+            "short_notes": 0.5,
+            "low_entropy": 0.5,   # Few distinct pitches
+            "drum_range": 0.3,    # Drum kits have fixed pitches
+        },
+        "bass": {
+            "low_median": 1.5,
+            "low_max": 0.5,
+            "monophonic": 1.0,
+            "light_polyphony": 0.3,
+            "moderate_density": 0.5,
+            "narrow_range": 0.3,  # Bass lines don't jump octaves much
+        },
+        "chords": {
+            "polyphonic": 1.5,
+            "mid_register": 0.5,
+            "chord_duration": 0.5,
+            "above_low_density": 0.3,
+        },
+        "pad": {
+            "polyphonic": 1.0,
+            "long_notes": 1.5,
+            "low_density": 0.5,   # Sustained notes
+            "mid_register": 0.3,
+        },
+        "lead": {
+            "monophonic": 1.0,
+            "light_polyphony": 0.3,
+            "wide_range": 1.0,    # Melodies move around
+            "high_median": 0.5,
+            "syncopated": 0.3,
+            "phrase_duration": 0.3,  # Approximates variable durations
+        },
+        "arp": {
+            "high_density": 1.5,
+            "short_notes": 1.0,
+            "repetitive": 1.0,    # Arps repeat patterns
+            "below_polyphonic": 0.5,  # Broken chords
+            "high_median": 0.3,
+        },
+    }
+
+    # Below this many scorable tracks, scoring each one on its own is
+    # faster than building a feature matrix
+    BATCH_MIN_TRACKS = 64
+
     def classify(self, track: Track) -> RoleProbabilities:
         """Classify a track's role based on its features.
 
@@ -45,212 +115,248 @@ class RoleClassifier:
         if features is None:
             return RoleProbabilities(other=1.0)
 
-        # Calculate individual role scores
-        drums_score = self._score_drums(features)
-        bass_score = self._score_bass(features)
-        chords_score = self._score_chords(features)
-        pad_score = self._score_pad(features)
-        lead_score = self._score_lead(features)
-        arp_score = self._score_arp(features)
-
-        # Normalize scores to probabilities
-        total = drums_score + bass_score + chords_score + pad_score + lead_score + arp_score
-
-        if total < 0.1:
-            # No strong indicators, classify as other
-            return RoleProbabilities(other=1.0)
-
-        return RoleProbabilities(
-            drums=drums_score / total,
-            bass=bass_score / total,
-            chords=chords_score / total,
-            pad=pad_score / total,
-            lead=lead_score / total,
-            arp=arp_score / total,
-            other=0.0,
-        )
-
-    def _score_drums(self, features: TrackFeatures) -> float:
-        """Score likelihood of drum track."""
-        score = 0.0
-
-        # Strong indicator: MIDI channel 10
         if features.is_channel_10:
-            score += 3.0
-
-        # High note density
-        if features.note_density > self.HIGH_DENSITY:
-            score += 1.0
-
-        # Short note durations
-        if features.avg_duration < self.SHORT_DURATION:
-            score += 0.5
-
-        # Low pitch class entropy (few distinct pitches)
-        if features.pitch_class_entropy < 0.5:
-            score += 0.5
-
-        # Limited pitch range (drum kits have fixed pitches)
-        if features.pitch_range < 48:  # 4 octaves
-            score += 0.3
-
-        return score
-
-    def _score_bass(self, features: TrackFeatures) -> float:
-        """Score likelihood of bass track."""
-        score = 0.0
-
-        # Avoid drum channel
-        if features.is_channel_10:
-            return 0.0
-
-        # Low register
-        if features.pitch_median < self.BASS_UPPER:
-            score += 1.5
-
-        if features.pitch_max < self.BASS_UPPER + 12:
-            score += 0.5
-
-        # Mostly monophonic
-        if features.polyphony_ratio < self.LOW_POLYPHONY:
-            score += 1.0
-        elif features.polyphony_ratio < self.HIGH_POLYPHONY:
-            score += 0.3
-
-        # Moderate density
-        if self.LOW_DENSITY < features.note_density < self.HIGH_DENSITY:
-            score += 0.5
-
-        # Limited pitch range (bass lines don't jump octaves much)
-        if features.pitch_range < 24:
-            score += 0.3
-
-        return score
-
-    def _score_chords(self, features: TrackFeatures) -> float:
-        """Score likelihood of chord/comping track."""
-        score = 0.0
-
-        # Avoid drum channel
-        if features.is_channel_10:
-            return 0.0
-
-        # Polyphonic
-        if features.polyphony_ratio > self.HIGH_POLYPHONY:
-            score += 1.5
-
-        # Mid register
-        if self.MID_LOWER < features.pitch_median < self.MID_UPPER:
-            score += 0.5
+            # Only the drum score applies on the drum channel, and the
+            # channel alone scores well above the "other" cutoff
+            return RoleProbabilities(drums=1.0, other=0.0)
 
-        # Moderate note duration
-        if self.SHORT_DURATION < features.avg_duration < self.LONG_DURATION * 2:
-            score += 0.5
+        # Tracks share few distinct condition outcomes, so probabilities
+        # are cached per outcome
+        return RoleProbabilities(*_probabilities(self._conditions(_feature_row(features))))
 
-        # Moderate density
-        if features.note_density > self.LOW_DENSITY:
-            score += 0.3
+    def classify_tracks(self, tracks: list[Track]) -> list[RoleProbabilities]:
+        """Classify several tracks' roles.
 
-        return score
+        Large batches are scored in one vectorized pass over a feature
+        matrix, smaller ones track by track.
 
-    def _score_pad(self, features: TrackFeatures) -> float:
-        """Score likelihood of pad track."""
-        score = 0.0
+        Args:
+            tracks: Tracks with extracted features.
 
-        # Avoid drum channel
-        if features.is_channel_10:
-            return 0.0
+        Returns:
+            RoleProbabilities for each track, in input order.
+        """
+        scored = [
+            i
+            for i, track in enumerate(tracks)
+            if track.features is not None and not track.features.is_channel_10
+        ]
+        if len(scored) < self.BATCH_MIN_TRACKS:
+            return [self.classify(track) for track in tracks]
+
+        # Tracks without features or on the drum channel take classify()'s
+        # shortcuts; the rest default to "other" until scored below
+        scored_rows = set(scored)
+        results = [
+            RoleProbabilities(other=1.0) if i in scored_rows else self.classify(track)
+            for i, track in enumerate(tracks)
+        ]
+
+        matrix = features_to_matrix([tracks[i].features for i in scored])  # type: ignore[misc]
+        scores = self._score_matrix(matrix)
 
-        # Polyphonic
-        if features.polyphony_ratio > self.HIGH_POLYPHONY:
-            score += 1.0
+        # Normalize scores to probabilities
+        totals = scores.sum(axis=1)
+        strong = totals >= 0.1
+        probabilities = scores[strong] / totals[strong, np.newaxis]
+        # Rows with no strong indicators stay "other"
+        for i, row in zip(np.asarray(scored)[strong].tolist(), probabilities.tolist(), strict=True):
+            drums, bass, chords, pad, lead, arp = row
+            results[i] = RoleProbabilities(
+                drums=drums,
+                bass=bass,
+                chords=chords,
+                pad=pad,
+                lead=lead,
+                arp=arp,
+                other=0.0,
+            )
+
+        return results
+
+    def _score_matrix(self, matrix: np.ndarray) -> np.ndarray:
+        """Score every role for each row of a feature matrix.
 
-        # Long note durations
-        if features.avg_duration > self.LONG_DURATION * 2:
-            score += 1.5
+        Args:
+            matrix: Feature matrix with FEATURE_COLUMNS as columns.
 
-        # Low density (sustained notes)
-        if features.note_density < self.LOW_DENSITY:
-            score += 0.5
+        Returns:
+            Array of shape (tracks, roles) with scores in ROLE_RULES order.
+        """
+        conditions = np.stack(self._conditions(tuple(matrix.T)), axis=1)
+        scores: np.ndarray = conditions.astype(np.float64) @ _WEIGHT_MATRIX
 
-        # Mid register
-        if self.MID_LOWER < features.pitch_median < self.MID_UPPER:
-            score += 0.3
+        # Only the drum score applies on the drum channel
+        scores[conditions[:, 0], 1:] = 0.0
+        return scores
 
-        return score
+    def _conditions(self, columns: tuple[Any, ...]) -> tuple[Any, ...]:
+        """Evaluate the threshold conditions used by ROLE_RULES.
 
-    def _score_lead(self, features: TrackFeatures) -> float:
-        """Score likelihood of lead/melody track."""
-        score = 0.0
+        Works on one track's feature values or on whole feature columns.
 
-        # Avoid drum channel
-        if features.is_channel_10:
-            return 0.0
+        Args:
+            columns: Values in FEATURE_COLUMNS order, either scalars or
+                equal-length arrays.
 
-        # Mostly monophonic
-        if features.polyphony_ratio < self.LOW_POLYPHONY:
-            score += 1.0
-        elif features.polyphony_ratio < self.HIGH_POLYPHONY:
-            score += 0.3
+        Returns:
+            Outcome of each condition in CONDITION_NAMES order, as a bool or
+            a boolean array per row.
+        """
+        (
+            is_channel_10,
+            note_density,
+            avg_duration,
+            pitch_class_entropy,
+            pitch_range,
+            pitch_median,
+            pitch_max,
+            polyphony_ratio,
+            syncopation_score,
+            repetition_score,
+        ) = columns
+        below_polyphonic = polyphony_ratio < self.HIGH_POLYPHONY
+
+        return (
+            is_channel_10 > 0,  # drum_channel
+            note_density > self.HIGH_DENSITY,  # high_density
+            avg_duration < self.SHORT_DURATION,  # short_notes
+            pitch_class_entropy < 0.5,  # low_entropy
+            pitch_range < 48,  # drum_range: 4 octaves
+            pitch_median < self.BASS_UPPER,  # low_median
+            pitch_max < self.BASS_UPPER + 12,  # low_max
+            polyphony_ratio < self.LOW_POLYPHONY,  # monophonic
+            (polyphony_ratio >= self.LOW_POLYPHONY) & below_polyphonic,  # light_polyphony
+            # moderate_density
+            (note_density > self.LOW_DENSITY) & (note_density < self.HIGH_DENSITY),
+            pitch_range < 24,  # narrow_range
+            polyphony_ratio > self.HIGH_POLYPHONY,  # polyphonic
+            # mid_register
+            (pitch_median > self.MID_LOWER) & (pitch_median < self.MID_UPPER),
+            # chord_duration
+            (avg_duration > self.SHORT_DURATION) & (avg_duration < self.LONG_DURATION * 2),
+            note_density > self.LOW_DENSITY,  # above_low_density
+            avg_duration > self.LONG_DURATION * 2,  # long_notes
+            note_density < self.LOW_DENSITY,  # low_density
+            pitch_range > self.WIDE_RANGE,  # wide_range
+            pitch_median > self.BASS_UPPER,  # high_median
+            syncopation_score > 0.2,  # syncopated
+            # phrase_duration
+            (avg_duration > self.SHORT_DURATION) & (avg_duration < self.LONG_DURATION),
+            repetition_score > self.HIGH_REPETITION,  # repetitive
+            below_polyphonic,  # below_polyphonic
+        )
 
-        # Wide pitch range (melodies move around)
-        if features.pitch_range > self.WIDE_RANGE:
-            score += 1.0
 
-        # Higher register
-        if features.pitch_median > self.BASS_UPPER:
-            score += 0.5
+# Conditions in the order RoleClassifier._conditions() returns them
+CONDITION_NAMES = (
+    "drum_channel",
+    "high_density",
+    "short_notes",
+    "low_entropy",
+    "drum_range",
+    "low_median",
+    "low_max",
+    "monophonic",
+    "light_polyphony",
+    "moderate_density",
+    "narrow_range",
+    "polyphonic",
+    "mid_register",
+    "chord_duration",
+    "above_low_density",
+    "long_notes",
+    "low_density",
+    "wide_range",
+    "high_median",
+    "syncopated",
+    "phrase_duration",
+    "repetitive",
+    "below_polyphonic",
+)
+
+# Rule weights of shape (conditions, roles), built once from ROLE_RULES
+_WEIGHT_MATRIX = np.array([
+    [rules.get(name, 0.0) for rules in RoleClassifier.ROLE_RULES.values()]
+    for name in CONDITION_NAMES
+])
+
+# Shared classifier for the convenience functions
+_CLASSIFIER = RoleClassifier()
+
+
+@functools.lru_cache(maxsize=4096)
+def _probabilities(conditions: tuple[bool, ...]) -> tuple[float, ...]:
+    """Get role probabilities for one track's condition outcomes.
 
-        # Moderate to high syncopation
-        if features.syncopation_score > 0.2:
-            score += 0.3
+    Args:
+        conditions: Outcomes in CONDITION_NAMES order.
 
-        # Variable durations (phrasing)
-        # This is approximated by moderate average duration
-        if self.SHORT_DURATION < features.avg_duration < self.LONG_DURATION:
-            score += 0.3
+    Returns:
+        Probabilities in RoleProbabilities field order, "other" last.
+    """
+    scores = (np.array(conditions, dtype=np.float64) @ _WEIGHT_MATRIX).tolist()
 
-        return score
+    # Normalize scores to probabilities
+    total = sum(scores)
 
-    def _score_arp(self, features: TrackFeatures) -> float:
-        """Score likelihood of arpeggiator track."""
-        score = 0.0
+    if total < 0.1:
+        # No strong indicators, classify as other
+        return (0.0,) * len(scores) + (1.0,)
 
-        # Avoid drum channel
-        if features.is_channel_10:
-            return 0.0
+    return (*(score / total for score in scores), 0.0)
 
-        # High note density
-        if features.note_density > self.HIGH_DENSITY:
-            score += 1.5
 
-        # Short note durations
-        if features.avg_duration < self.SHORT_DURATION:
-            score += 1.0
+def classify_track_role(track: Track) -> RoleProbabilities:
+    """Convenience function to classify a track's role.
 
-        # High repetition (arps repeat patterns)
-        if features.repetition_score > self.HIGH_REPETITION:
-            score += 1.0
+    Args:
+        track: Track with extracted features.
 
-        # Mostly monophonic (broken chords)
-        if features.polyphony_ratio < self.HIGH_POLYPHONY:
-            score += 0.5
+    Returns:
+        RoleProbabilities with scores for each role.
+    """
+    return _CLASSIFIER.classify(track)
 
-        # Mid-high register
-        if features.pitch_median > self.BASS_UPPER:
-            score += 0.3
 
-        return score
+def features_to_matrix(features: list[TrackFeatures]) -> np.ndarray:
+    """Build a feature matrix for batch role scoring.
 
+    Args:
+        features: Track features, one row each.
 
-def classify_track_role(track: Track) -> RoleProbabilities:
-    """Convenience function to classify a track's role.
+    Returns:
+        Float array of shape (len(features), len(FEATURE_COLUMNS)).
+    """
+    matrix = np.empty((len(features), len(FEATURE_COLUMNS)), dtype=np.float64)
+    for row, f in enumerate(features):
+        matrix[row] = _feature_row(f)
+    return matrix
+
+
+def _feature_row(f: TrackFeatures) -> tuple[float, ...]:
+    """Get a track's scoring features in FEATURE_COLUMNS order."""
+    return (
+        f.is_channel_10,
+        f.note_density,
+        f.avg_duration,
+        f.pitch_class_entropy,
+        f.pitch_range,
+        f.pitch_median,
+        f.pitch_max,
+        f.polyphony_ratio,
+        f.syncopation_score,
+        f.repetition_score,
+    )
+
+
+def classify_track_roles(tracks: list[Track]) -> list[RoleProbabilities]:
+    """Convenience function to classify several tracks' roles at once.
 
     Args:
-        track: Track with extracted features.
+        tracks: Tracks with extracted features.
 
     Returns:
-        RoleProbabilities with scores for each role.
+        RoleProbabilities for each track, in input order.
     """
-    classifier = RoleClassifier()
-    return classifier.classify(track)
+    return _CLASSIFIER.classify_tracks(tracks)
@@ -13,7 +13,7 @@ from typing import TYPE_CHECKING
 import numpy as np
 
 if TYPE_CHECKING:
-    from midi_analyzer.models.core import NoteEvent, RoleProbabilities, Song, Track
+    from midi_analyzer.models.core import RoleProbabilities, Song, Track
 
 
 class SectionType(Enum):
@@ -30,6 +30,11 @@ class SectionType(Enum):
     UNKNOWN = "unknown"
 
 
+# Fixed order of roles in BarFeatures.role_densities and feature vectors
+BAR_ROLES = ("bass", "drums", "lead", "pad", "arp", "chords", "other")
+_DRUMS = BAR_ROLES.index("drums")
+
+
 @dataclass
 class BarFeatures:
     """Feature vector for a single bar.
@@ -40,7 +45,7 @@ class BarFeatures:
         end_beat: End beat of this bar.
         active_track_count: Number of tracks with notes in this bar.
         total_note_count: Total notes across all tracks.
-        density_by_role: Note density per role (bass, drums, lead, etc.).
+        role_densities: Note density per role, in BAR_ROLES order.
         harmonic_rhythm: Number of chord changes in this bar.
         avg_velocity: Average note velocity.
         pitch_range: Range of pitches (max - min).
@@ -52,31 +57,69 @@ class BarFeatures:
     end_beat: float
     active_track_count: int = 0
     total_note_count: int = 0
-    density_by_role: dict[str, float] = field(default_factory=dict)
+    role_densities: np.ndarray = field(
+        default_factory=lambda: np.zeros(len(BAR_ROLES), dtype=np.float64)
+    )
     harmonic_rhythm: int = 0
     avg_velocity: float = 0.0
     pitch_range: int = 0
     unique_pitches: int = 0
 
-    def to_vector(self) -> np.ndarray:
+    @property
+    def density_by_role(self) -> dict[str, float]:
+        """Note density for each role present in this bar."""
+        return {
+            role: float(density)
+            for role, density in zip(BAR_ROLES, self.role_densities, strict=True)
+            if density > 0
+        }
+
+    def to_vector(self, out: np.ndarray | None = None) -> np.ndarray:
         """Convert to numpy vector for similarity computation.
 
+        Args:
+            out: Optional float32 array of length 13 to fill in place,
+                such as a row of a preallocated matrix.
+
         Returns:
-            Feature vector as numpy array.
+            Feature vector as numpy array (``out`` if given).
         """
-        # Fixed order of roles for consistent vectorization
-        roles = ["bass", "drums", "lead", "pad", "arp", "chords", "other"]
-        role_densities = [self.density_by_role.get(r, 0.0) for r in roles]
+        if out is None:
+            out = np.empty(6 + len(BAR_ROLES), dtype=np.float32)
+
+        roles_end = 2 + len(BAR_ROLES)
+        out[0] = self.active_track_count / 16.0  # Normalize assuming max 16 tracks
+        out[1] = self.total_note_count / 100.0   # Normalize assuming typical max
+        out[2:roles_end] = self.role_densities
+        out[roles_end] = self.harmonic_rhythm / 4.0  # Normalize assuming max 4 per bar
+        out[roles_end + 1] = self.avg_velocity / 127.0
+        out[roles_end + 2] = self.pitch_range / 88.0     # Normalize to piano range
+        out[roles_end + 3] = self.unique_pitches / 12.0  # Normalize to octave
+        return out
+
+
+def _bars_to_matrix(bars: list[BarFeatures]) -> np.ndarray:
+    """Stack bar feature vectors into one matrix.
 
-        return np.array([
-            self.active_track_count / 16.0,  # Normalize assuming max 16 tracks
-            self.total_note_count / 100.0,   # Normalize assuming typical max
-            *role_densities,
-            self.harmonic_rhythm / 4.0,      # Normalize assuming max 4 per bar
-            self.avg_velocity / 127.0,
-            self.pitch_range / 88.0,         # Normalize to piano range
-            self.unique_pitches / 12.0,      # Normalize to octave
-        ], dtype=np.float32)
+    Builds the same rows as BarFeatures.to_vector() column by column,
+    without allocating a small array per bar.
+
+    Args:
+        bars: Bar features to convert.
+
+    Returns:
+        Float32 matrix with one feature vector per row.
+    """
+    matrix = np.empty((len(bars), 6 + len(BAR_ROLES)), dtype=np.float32)
+    matrix[:, 0] = np.array([b.active_track_count for b in bars], dtype=np.float64) / 16.0
+    matrix[:, 1] = np.array([b.total_note_count for b in bars], dtype=np.float64) / 100.0
+    col = 2 + len(BAR_ROLES)
+    matrix[:, 2:col] = np.stack([b.role_densities for b in bars])
+    matrix[:, col] = np.array([b.harmonic_rhythm for b in bars], dtype=np.float64) / 4.0
+    matrix[:, col + 1] = np.array([b.avg_velocity for b in bars], dtype=np.float64) / 127.0
+    matrix[:, col + 2] = np.array([b.pitch_range for b in bars], dtype=np.float64) / 88.0
+    matrix[:, col + 3] = np.array([b.unique_pitches for b in bars], dtype=np.float64) / 12.0
+    return matrix
 
 
 @dataclass
@@ -170,8 +213,12 @@ class SectionAnalyzer:
         if len(bar_features) < self.min_section_bars:
             return SectionAnalysis(bar_features=bar_features)
 
-        # Detect section boundaries via novelty
-        boundaries = self._detect_boundaries(bar_features)
+        # Detect section boundaries via novelty; a song too short to hold
+        # two sections of min_section_bars is a single section
+        if len(bar_features) < 2 * self.min_section_bars:
+            boundaries = [0]
+        else:
+            boundaries = self._detect_boundaries(bar_features)
 
         # Create sections from boundaries
         sections = self._create_sections(bar_features, boundaries)
@@ -195,6 +242,10 @@ class SectionAnalyzer:
     def _compute_bar_features(self, song: Song) -> list[BarFeatures]:
         """Compute per-bar feature vectors.
 
+        Every note is visited once: notes from all tracks are tagged with
+        their bar and scatter-added into per-bar accumulators, instead of
+        re-scanning every track for each bar.
+
         Args:
             song: Song to analyze.
 
@@ -206,99 +257,116 @@ class SectionAnalyzer:
         if song.time_sig_map:
             beats_per_bar = song.time_sig_map[0].beats_per_bar
 
-        # Find song end
-        all_notes: list[NoteEvent] = []
-        for track in song.tracks:
-            all_notes.extend(track.notes)
-
-        if not all_notes:
+        tracks = [t for t in song.tracks if t.notes]
+        if not tracks:
             return []
 
-        max_beat = max(n.start_beat + n.duration_beats for n in all_notes)
+        # Find song end
+        max_beat = max(
+            float((t.note_arrays["start_beat"] + t.note_arrays["duration_beats"]).max())
+            for t in tracks
+        )
         num_bars = int(np.ceil(max_beat / beats_per_bar))
 
+        # Gather every note once, tagged with its bar, track and role
+        bar_chunks: list[np.ndarray] = []
+        track_chunks: list[np.ndarray] = []
+        role_chunks: list[np.ndarray] = []
+        pitch_chunks: list[np.ndarray] = []
+        velocity_chunks: list[np.ndarray] = []
+
+        for track_num, track in enumerate(tracks):
+            arrays = track.note_arrays
+            bar_idx = self._bar_indices(arrays["start_beat"], beats_per_bar)
+            in_song = (bar_idx >= 0) & (bar_idx < num_bars)
+            bar_idx = bar_idx[in_song]
+
+            role_num = BAR_ROLES.index(self._get_track_role(track))
+            bar_chunks.append(bar_idx)
+            track_chunks.append(np.full(len(bar_idx), track_num))
+            role_chunks.append(np.full(len(bar_idx), role_num))
+            pitch_chunks.append(arrays["pitch"][in_song])
+            velocity_chunks.append(arrays["velocity"][in_song])
+
+        bars = np.concatenate(bar_chunks)
+        pitches = np.concatenate(pitch_chunks).astype(np.int64)
+
+        # Scatter-add each note into the per-bar accumulators
+        total_notes = np.bincount(bars, minlength=num_bars)
+        velocity_sums = np.bincount(
+            bars, weights=np.concatenate(velocity_chunks), minlength=num_bars
+        )
+
+        active = np.zeros((num_bars, len(tracks)), dtype=bool)
+        active[bars, np.concatenate(track_chunks)] = True
+        active_tracks = active.sum(axis=1)
+
+        # Density by role (notes per beat)
+        role_counts = np.bincount(
+            bars * len(BAR_ROLES) + np.concatenate(role_chunks),
+            minlength=num_bars * len(BAR_ROLES),
+        ).reshape(num_bars, len(BAR_ROLES))
+        role_densities = role_counts / beats_per_bar
+
+        pitch_min = np.full(num_bars, 128, dtype=np.int64)
+        pitch_max = np.full(num_bars, -1, dtype=np.int64)
+        np.minimum.at(pitch_min, bars, pitches)
+        np.maximum.at(pitch_max, bars, pitches)
+        pitch_ranges = np.where(total_notes > 0, pitch_max - pitch_min, 0)
+
+        pitch_seen = np.zeros((num_bars, 128), dtype=bool)
+        pitch_seen[bars, pitches] = True
+        unique_pitches = pitch_seen.sum(axis=1)
+
+        # Harmonic rhythm would require chord analysis per bar
+        # For now, estimate from note onset clustering
+        harmonic_rhythm = self._estimate_harmonic_rhythm(song, num_bars, beats_per_bar)
+
         bar_features: list[BarFeatures] = []
 
         for bar_num in range(num_bars):
             start_beat = bar_num * beats_per_bar
             end_beat = start_beat + beats_per_bar
 
-            features = self._compute_single_bar_features(
-                song, bar_num, start_beat, end_beat
+            features = BarFeatures(
+                bar_number=bar_num,
+                start_beat=start_beat,
+                end_beat=end_beat,
+                active_track_count=int(active_tracks[bar_num]),
+                total_note_count=int(total_notes[bar_num]),
+                role_densities=role_densities[bar_num],
+                harmonic_rhythm=int(harmonic_rhythm[bar_num]),
+                pitch_range=int(pitch_ranges[bar_num]),
+                unique_pitches=int(unique_pitches[bar_num]),
             )
+
+            if total_notes[bar_num]:
+                features.avg_velocity = float(velocity_sums[bar_num] / total_notes[bar_num])
+
             bar_features.append(features)
 
         return bar_features
 
-    def _compute_single_bar_features(
-        self,
-        song: Song,
-        bar_num: int,
-        start_beat: float,
-        end_beat: float,
-    ) -> BarFeatures:
-        """Compute features for a single bar.
+    @staticmethod
+    def _bar_indices(starts: np.ndarray, beats_per_bar: float) -> np.ndarray:
+        """Map note start beats to bar numbers.
+
+        Matches the ``bar * beats_per_bar <= start < bar * beats_per_bar +
+        beats_per_bar`` test used for bar boundaries, correcting any
+        rounding in the division.
 
         Args:
-            song: Song being analyzed.
-            bar_num: Bar number.
-            start_beat: Start beat of bar.
-            end_beat: End beat of bar.
+            starts: Note start beats.
+            beats_per_bar: Bar length in beats.
 
         Returns:
-            BarFeatures for this bar.
+            Integer bar index per note.
         """
-        features = BarFeatures(
-            bar_number=bar_num,
-            start_beat=start_beat,
-            end_beat=end_beat,
-        )
-
-        active_tracks = 0
-        total_notes = 0
-        all_velocities: list[int] = []
-        all_pitches: list[int] = []
-        density_by_role: dict[str, float] = {}
-
-        for track in song.tracks:
-            # Get notes in this bar
-            bar_notes = [
-                n for n in track.notes
-                if start_beat <= n.start_beat < end_beat
-            ]
-
-            if bar_notes:
-                active_tracks += 1
-                total_notes += len(bar_notes)
-
-                # Collect velocity and pitch data
-                all_velocities.extend(n.velocity for n in bar_notes)
-                all_pitches.extend(n.pitch for n in bar_notes)
-
-                # Compute density by role
-                role = self._get_track_role(track)
-                bar_duration = end_beat - start_beat
-                density = len(bar_notes) / bar_duration
-                density_by_role[role] = density_by_role.get(role, 0.0) + density
-
-        features.active_track_count = active_tracks
-        features.total_note_count = total_notes
-        features.density_by_role = density_by_role
-
-        if all_velocities:
-            features.avg_velocity = sum(all_velocities) / len(all_velocities)
-
-        if all_pitches:
-            features.pitch_range = max(all_pitches) - min(all_pitches)
-            features.unique_pitches = len(set(all_pitches))
-
-        # Harmonic rhythm would require chord analysis per bar
-        # For now, estimate from note onset clustering
-        features.harmonic_rhythm = self._estimate_harmonic_rhythm(
-            song, start_beat, end_beat
-        )
-
-        return features
+        bar_idx = np.floor(starts / beats_per_bar).astype(np.int64)
+        bar_starts = bar_idx * beats_per_bar
+        bar_idx -= bar_starts > starts
+        bar_idx += bar_starts + beats_per_bar <= starts
+        return bar_idx
 
     def _get_track_role(self, track: Track) -> str:
         """Get the dominant role for a track.
@@ -313,59 +381,55 @@ class SectionAnalyzer:
             return "other"
 
         probs = track.role_probs
-        roles = [
-            ("bass", probs.bass),
-            ("drums", probs.drums),
-            ("lead", probs.lead),
-            ("pad", probs.pad),
-            ("arp", probs.arp),
-            ("chords", probs.chords),
-        ]
+        # Same order as BAR_ROLES, so ties go to the earlier role
+        values = (probs.bass, probs.drums, probs.lead, probs.pad, probs.arp, probs.chords)
 
-        best_role, best_prob = max(roles, key=lambda x: x[1])
-        return best_role if best_prob > 0.3 else "other"
+        best_prob = max(values)
+        return BAR_ROLES[values.index(best_prob)] if best_prob > 0.3 else "other"
 
     def _estimate_harmonic_rhythm(
         self,
         song: Song,
-        start_beat: float,
-        end_beat: float,
-    ) -> int:
+        num_bars: int,
+        beats_per_bar: float,
+    ) -> np.ndarray:
         """Estimate harmonic rhythm from bass note changes.
 
+        Bass notes from all bass tracks are sorted by start once, so each
+        bar is a contiguous slice found by binary search.
+
         Args:
             song: Song being analyzed.
-            start_beat: Start beat.
-            end_beat: End beat.
+            num_bars: Number of bars in the song.
+            beats_per_bar: Bar length in beats.
 
         Returns:
-            Estimated chord changes in this bar.
+            Estimated chord changes per bar.
         """
         # Look for bass tracks and count distinct bass notes
-        bass_notes: list[NoteEvent] = []
-
-        for track in song.tracks:
-            if track.role_probs and track.role_probs.bass > 0.5:
-                bar_notes = [
-                    n for n in track.notes
-                    if start_beat <= n.start_beat < end_beat
-                ]
-                bass_notes.extend(bar_notes)
-
-        if not bass_notes:
-            return 0
-
-        # Count pitch class changes (likely chord changes)
-        bass_notes.sort(key=lambda n: n.start_beat)
-        changes = 0
-        prev_pc = None
-
-        for note in bass_notes:
-            pc = note.pitch % 12
-            if prev_pc is not None and pc != prev_pc:
-                changes += 1
-            prev_pc = pc
-
+        bass_tracks = [
+            t.note_arrays for t in song.tracks
+            if t.role_probs and t.role_probs.bass > 0.5
+        ]
+        if not bass_tracks:
+            return np.zeros(num_bars, dtype=np.int64)
+
+        starts = np.concatenate([arrays["start_beat"] for arrays in bass_tracks])
+        order = np.argsort(starts, kind="stable")
+        starts = starts[order]
+        pitch_classes = np.concatenate([arrays["pitch"] for arrays in bass_tracks])[order] % 12
+
+        # Count pitch class changes (likely chord changes); changes_before[k]
+        # is the number of changes between sorted notes 0..k
+        changes_before = np.zeros(len(starts), dtype=np.int64)
+        np.cumsum(pitch_classes[1:] != pitch_classes[:-1], out=changes_before[1:])
+
+        bar_starts = np.arange(num_bars) * beats_per_bar
+        lo = np.searchsorted(starts, bar_starts, side="left")
+        hi = np.searchsorted(starts, bar_starts + beats_per_bar, side="left")
+        has_notes = hi > lo
+        changes = np.zeros(num_bars, dtype=np.int64)
+        changes[has_notes] = changes_before[hi[has_notes] - 1] - changes_before[lo[has_notes]]
         return changes
 
     def _detect_boundaries(self, bar_features: list[BarFeatures]) -> list[int]:
@@ -381,29 +445,28 @@ class SectionAnalyzer:
             return [0]
 
         # Convert to feature matrix
-        vectors = np.array([bf.to_vector() for bf in bar_features])
+        vectors = _bars_to_matrix(bar_features)
 
         # Compute novelty curve (distance between consecutive bars)
         novelty = np.zeros(len(bar_features))
-        for i in range(1, len(vectors)):
-            novelty[i] = np.linalg.norm(vectors[i] - vectors[i - 1])
+        novelty[1:] = np.linalg.norm(np.diff(vectors, axis=0), axis=1)
 
         # Find peaks above threshold
         mean_novelty = np.mean(novelty[1:])  # Exclude first bar
         std_novelty = np.std(novelty[1:])
         threshold = mean_novelty + self.novelty_threshold * std_novelty
 
+        # Local maxima above threshold (excluding first and last bar)
+        inner = novelty[1:-1]
+        peaks = (inner > threshold) & (inner >= novelty[:-2]) & (inner >= novelty[2:])
+
         # Always include bar 0 as a boundary
         boundaries = [0]
 
-        # Find local maxima above threshold
-        for i in range(1, len(novelty) - 1):
-            if novelty[i] > threshold:
-                # Check if local maximum
-                if novelty[i] >= novelty[i - 1] and novelty[i] >= novelty[i + 1]:
-                    # Ensure minimum distance from previous boundary
-                    if i - boundaries[-1] >= self.min_section_bars:
-                        boundaries.append(i)
+        for i in (np.flatnonzero(peaks) + 1).tolist():
+            # Ensure minimum distance from previous boundary
+            if i - boundaries[-1] >= self.min_section_bars:
+                boundaries.append(i)
 
         return boundaries
 
@@ -467,25 +530,27 @@ class SectionAnalyzer:
             end_beat=bars[-1].end_beat,
         )
 
-        avg.active_track_count = int(
-            sum(b.active_track_count for b in bars) / len(bars)
-        )
-        avg.total_note_count = int(
-            sum(b.total_note_count for b in bars) / len(bars)
-        )
-        avg.avg_velocity = sum(b.avg_velocity for b in bars) / len(bars)
-        avg.pitch_range = int(sum(b.pitch_range for b in bars) / len(bars))
-        avg.unique_pitches = int(sum(b.unique_pitches for b in bars) / len(bars))
-        avg.harmonic_rhythm = int(sum(b.harmonic_rhythm for b in bars) / len(bars))
-
-        # Merge density by role
-        all_roles: set[str] = set()
+        # Accumulate every field in a single pass over the bars
+        active_tracks = total_notes = pitch_range = unique_pitches = harmonic_rhythm = 0
+        velocity = 0.0
+        role_densities = np.zeros(len(BAR_ROLES), dtype=np.float64)
         for b in bars:
-            all_roles.update(b.density_by_role.keys())
-
-        for role in all_roles:
-            densities = [b.density_by_role.get(role, 0.0) for b in bars]
-            avg.density_by_role[role] = sum(densities) / len(densities)
+            active_tracks += b.active_track_count
+            total_notes += b.total_note_count
+            velocity += b.avg_velocity
+            pitch_range += b.pitch_range
+            unique_pitches += b.unique_pitches
+            harmonic_rhythm += b.harmonic_rhythm
+            role_densities += b.role_densities
+
+        n = len(bars)
+        avg.active_track_count = int(active_tracks / n)
+        avg.total_note_count = int(total_notes / n)
+        avg.avg_velocity = velocity / n
+        avg.pitch_range = int(pitch_range / n)
+        avg.unique_pitches = int(unique_pitches / n)
+        avg.harmonic_rhythm = int(harmonic_rhythm / n)
+        avg.role_densities = role_densities / n
 
         return avg
 
@@ -502,59 +567,56 @@ class SectionAnalyzer:
             return sections
 
         # Get feature vectors for each section
-        vectors = []
-        for section in sections:
-            if section.avg_features:
-                vectors.append(section.avg_features.to_vector())
-            else:
-                vectors.append(np.zeros(13, dtype=np.float32))
-
-        vectors = np.array(vectors)
+        vectors = np.zeros((len(sections), 6 + len(BAR_ROLES)), dtype=np.float32)
+        with_features = [i for i, section in enumerate(sections) if section.avg_features]
+        if with_features:
+            vectors[with_features] = _bars_to_matrix(
+                [sections[i].avg_features for i in with_features]  # type: ignore[misc]
+            )
 
-        # Simple greedy clustering
+        # Simple greedy clustering over preallocated centroid buffers;
+        # only the first num_forms rows/columns are in use
         form_labels = [""] * len(sections)
-        form_centroids: list[np.ndarray] = []
-        current_label = ord("A")
+        centroids = np.empty((self.MAX_FORMS, vectors.shape[1]), dtype=np.float32)
+        # Pairwise centroid distances (inf on the diagonal), kept in step with centroids
+        pair_dists = np.full((self.MAX_FORMS, self.MAX_FORMS), np.inf, dtype=np.float32)
+        num_forms = 0
 
         for i, vec in enumerate(vectors):
-            # Find closest existing cluster
-            best_cluster = -1
-            best_distance = float("inf")
+            active = centroids[:num_forms]
 
-            for j, centroid in enumerate(form_centroids):
-                dist = np.linalg.norm(vec - centroid)
-                if dist < best_distance:
-                    best_distance = dist
-                    best_cluster = j
+            # Find closest existing cluster
+            distances = np.linalg.norm(active - vec, axis=1)
+            best_cluster = int(distances.argmin()) if num_forms else -1
+            best_distance = distances[best_cluster] if num_forms else float("inf")
 
             # Threshold for creating new cluster
-            # Use mean distance between all pairs as reference
+            # Use the closest pair of existing centroids as reference
             threshold = 0.5  # Base threshold
-            if len(form_centroids) >= 2:
-                all_dists = []
-                for j in range(len(form_centroids)):
-                    for k in range(j + 1, len(form_centroids)):
-                        all_dists.append(
-                            np.linalg.norm(form_centroids[j] - form_centroids[k])
-                        )
-                if all_dists:
-                    threshold = min(all_dists) * 0.7
+            if num_forms >= 2:
+                threshold = pair_dists[:num_forms, :num_forms].min() * 0.7
 
             if best_cluster == -1 or (
                 best_distance > threshold
-                and len(form_centroids) < self.MAX_FORMS
+                and num_forms < self.MAX_FORMS
             ):
                 # Create new cluster
-                form_labels[i] = chr(current_label)
-                form_centroids.append(vec.copy())
-                current_label += 1
+                form_labels[i] = chr(ord("A") + num_forms)
+                pair_dists[num_forms, :num_forms] = distances
+                pair_dists[:num_forms, num_forms] = distances
+                centroids[num_forms] = vec
+                num_forms += 1
             else:
                 # Assign to existing cluster
                 form_labels[i] = chr(ord("A") + best_cluster)
-                # Update centroid (moving average)
-                form_centroids[best_cluster] = (
-                    form_centroids[best_cluster] * 0.8 + vec * 0.2
-                )
+                # Update centroid (moving average) in place, then its distances
+                centroid = centroids[best_cluster]
+                centroid *= 0.8
+                centroid += vec * 0.2
+                moved = np.linalg.norm(active - centroid, axis=1)
+                moved[best_cluster] = np.inf
+                pair_dists[best_cluster, :num_forms] = moved
+                pair_dists[:num_forms, best_cluster] = moved
 
         # Apply labels to sections
         for i, section in enumerate(sections):
@@ -599,7 +661,7 @@ class SectionAnalyzer:
 
             # Breakdown: significant energy drop
             if curr.total_note_count < prev_sec.total_note_count * 0.4:
-                if curr.density_by_role.get("drums", 0) < 0.5:
+                if curr.role_densities[_DRUMS] < 0.5:
                     sections[i].type_hint = SectionType.BREAKDOWN
                     sections[i].type_confidence = 0.6
 
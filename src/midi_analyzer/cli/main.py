@@ -2,14 +2,35 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
+import itertools
 import json
+import os
+import sys
+import tempfile
+import traceback
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
+from typing import TYPE_CHECKING, TypeVar
 
 import click
 
 from midi_analyzer import __version__
 from midi_analyzer.models.core import TrackRole
 
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Iterator
+    from concurrent.futures import Executor, Future
+
+    from midi_analyzer.analysis.arpeggios import ArpAnalysis
+    from midi_analyzer.models.core import Song
+
+_T = TypeVar("_T")
+
 
 # ANSI color codes for terminal output
 class Colors:
@@ -26,8 +47,14 @@ class Colors:
     END = "\033[0m"
 
 
+# Style output only on a terminal, and never when NO_COLOR is set
+_USE_COLOR = sys.stdout.isatty() and "NO_COLOR" not in os.environ
+
+
 def color(text: str, *codes: str) -> str:
-    """Apply color codes to text."""
+    """Apply color codes to text, or return it plain if color is off."""
+    if not _USE_COLOR:
+        return str(text)
     return "".join(codes) + str(text) + Colors.END
 
 
@@ -40,17 +67,318 @@ def color(text: str, *codes: str) -> str:
     type=click.Path(exists=True, path_type=Path),
     help="Path to configuration file.",
 )
+@click.option(
+    "--no-cache",
+    is_flag=True,
+    help="Parse MIDI files afresh instead of using the song cache.",
+)
 @click.pass_context
-def cli(ctx: click.Context, verbose: bool, config: Path | None) -> None:
+def cli(ctx: click.Context, verbose: bool, config: Path | None, no_cache: bool) -> None:
     """MIDI Pattern Extractor - Analyze MIDI files to extract reusable patterns."""
     ctx.ensure_object(dict)
     ctx.obj["verbose"] = verbose
     ctx.obj["config"] = config
+    ctx.obj["use_cache"] = not no_cache
 
 
 # Default library database path
 DEFAULT_LIBRARY = Path("midi_library.db")
 
+# Name of a ChordEvent's chord, for joining progressions
+_chord_name = attrgetter("chord.name")
+
+# Short names for common General MIDI drum notes
+_DRUM_NAMES: dict[int, str] = {
+    36: "kick", 38: "snare", 42: "hihat-c",
+    46: "hihat-o", 41: "tom-lo", 45: "tom-mid",
+    48: "tom-hi", 49: "crash", 51: "ride",
+}
+
+
+def _to_json(data: object) -> str:
+    """Serialize data as indented JSON, using orjson when it is installed.
+
+    Both encoders produce the same values when parsed, but the text can
+    differ: orjson writes non-ASCII characters as-is rather than as \\u
+    escapes, writes NaN and infinities as null, and formats some floats
+    differently (1e-05 as 0.00001). Write the result out as UTF-8.
+
+    Args:
+        data: JSON-compatible data.
+
+    Returns:
+        JSON text with two-space indentation.
+    """
+    try:
+        import orjson
+    except ImportError:
+        return json.dumps(data, indent=2)
+    return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+
+
+def _echo_batched(entries: Iterable[str], batch_size: int = 50) -> int:
+    """Echo entries as they arrive, combining them into fewer writes.
+
+    Each entry is printed as if by its own click.echo call, but up to
+    batch_size entries share a single write.
+
+    Args:
+        entries: Text to print, one item per echo.
+        batch_size: Maximum entries per write.
+
+    Returns:
+        Number of entries printed.
+    """
+    count = 0
+    entries = iter(entries)
+    while batch := list(itertools.islice(entries, batch_size)):
+        click.echo("\n".join(batch))
+        count += len(batch)
+    return count
+
+
+def _load_song(file_path: Path, use_cache: bool = True) -> tuple[Song, bool]:
+    """Parse a MIDI file, through the song cache unless it is disabled.
+
+    Args:
+        file_path: MIDI file to parse.
+        use_cache: Whether to use the on-disk song cache.
+
+    Returns:
+        Tuple of (parsed Song, whether it was loaded from the cache).
+    """
+    if not use_cache:
+        from midi_analyzer.ingest import parse_midi_file
+
+        return parse_midi_file(file_path), False
+
+    from midi_analyzer.ingest.cache import load_song
+
+    return load_song(file_path)
+
+
+@dataclass
+class _FileReport:
+    """Result of analyzing one file in the analyze command."""
+
+    path: Path
+    output: str
+    error: str | None = None
+    traceback: str | None = None
+    cached: bool = False
+
+
+@dataclass(slots=True)
+class _ArpResult:
+    """Arpeggio analysis of one track in the arpeggios command."""
+
+    track_index: int
+    track_name: str
+    arp_probability: float
+    analysis: ArpAnalysis
+
+
+def _analyze_file(
+    file_path: Path,
+    verbose: bool,
+    sections: bool,
+    arpeggios: bool,
+    use_cache: bool = True,
+    parsed: Future[tuple[Song, bool]] | None = None,
+) -> _FileReport:
+    """Analyze one MIDI file for the analyze command.
+
+    Runs in a worker process, so output is collected and returned rather
+    than echoed.
+
+    Args:
+        file_path: MIDI file to analyze.
+        verbose: Include detailed per-track output.
+        sections: Include section structure analysis.
+        arpeggios: Include arpeggio pattern analysis.
+        use_cache: Whether to use the on-disk song cache.
+        parsed: Pending _load_song of file_path started ahead of time, if any.
+
+    Returns:
+        Report with the formatted output, or the error if analysis failed.
+    """
+    import numpy as np
+
+    from midi_analyzer.harmony import detect_key_for_song, detect_chord_progression_for_song
+    from midi_analyzer.analysis import classify_track_roles, FeatureExtractor
+    from midi_analyzer.analysis.sections import analyze_sections, SectionType
+    from midi_analyzer.analysis.arpeggios import analyze_arp_track
+
+    feature_extractor = FeatureExtractor()
+    output: list[str] = []
+    out = output.append
+    cached = False
+
+    try:
+        song, cached = parsed.result() if parsed is not None else _load_song(file_path, use_cache)
+        key = detect_key_for_song(song)
+
+        # Basic summary line
+        out(f"\n{color(file_path.name, Colors.BOLD, Colors.CYAN)}: {key.root_name} {key.mode.value} ({len(song.tracks)} tracks)")
+
+        if verbose:
+            # Show timing info
+            out(f"  Tempo: {song.primary_tempo:.1f} BPM, Time sig: {song.primary_time_sig}")
+            out(f"  Duration: {song.total_beats:.1f} beats ({song.total_bars} bars)")
+
+            # Detect chord progression
+            chords = detect_chord_progression_for_song(song)
+            if chords.chords:
+                truncated = len(chords.chords) > 8
+                shown = itertools.islice(chords.chords, 8)
+                progression = " → ".join(map(_chord_name, shown))
+                out(f"  Chords: {progression}{' ...' if truncated else ''}")
+
+            # Show each track with role and stats
+            out(f"  Tracks:")
+            beats_scale = 1.0 / song.total_beats if song.total_beats > 0 else 0.0
+            note_tracks = [(i, t) for i, t in enumerate(song.tracks) if t.notes]
+
+            # Extract features, then classify every track in one call
+            all_features = [
+                feature_extractor.extract_features(t, song.total_bars or 1) for _, t in note_tracks
+            ]
+            for (_, track), features in zip(note_tracks, all_features, strict=True):
+                track.features = features
+            all_role_probs = classify_track_roles([t for _, t in note_tracks])
+
+            for (i, track), features, role_probs in zip(
+                note_tracks, all_features, all_role_probs, strict=True
+            ):
+                role = role_probs.primary_role()
+
+                # Pitch range, already reduced during feature extraction
+                pitch_range = f"{features.pitch_min}-{features.pitch_max}"
+
+                # Note density
+                notes_per_beat = len(track.notes) * beats_scale
+
+                track_name = track.name or f"Track {i}"
+                out(
+                    f"    [{role.value:6}] {track_name}: "
+                    f"{len(track.notes)} notes, "
+                    f"pitch {pitch_range}, "
+                    f"{notes_per_beat:.1f} notes/beat"
+                )
+
+                # Show note distribution for drums
+                if role == TrackRole.DRUMS and verbose:
+                    # Count notes by pitch (drum sounds)
+                    pitches, first_seen, counts = np.unique(
+                        track.note_arrays["pitch"], return_index=True, return_counts=True
+                    )
+                    # Unique keys rank by count, then earliest first hit as
+                    # Counter.most_common does, so a partial partition picks
+                    # the same top 3 as a full sort
+                    note_count = len(track.notes)
+                    keys = counts * (note_count + 1) + (note_count - first_seen)
+                    top = np.argpartition(keys, -3)[-3:] if len(keys) > 3 else np.arange(len(keys))
+                    top = top[np.argsort(-keys[top])]
+                    top_drums = [(int(pitches[j]), int(counts[j])) for j in top]
+                    top_str = ", ".join(
+                        f"{_DRUM_NAMES.get(p, f'n{p}')}:{c}"
+                        for p, c in top_drums
+                    )
+                    out(f"             Top hits: {top_str}")
+
+                # Show arpeggio analysis for arp tracks
+                if arpeggios and role == TrackRole.ARP:
+                    track.role_probs = role_probs
+                    arp_analysis = analyze_arp_track(track, song)
+                    if arp_analysis.patterns:
+                        out(f"             {color('Arpeggio patterns:', Colors.GREEN)}")
+                        for j, pattern in enumerate(arp_analysis.patterns[:3]):
+                            intervals = pattern.interval_sequence[:4]
+                            interval_str = " ".join(str(i) for i in intervals)
+                            out(
+                                f"               [{j+1}] Rate: {pattern.rate}, "
+                                f"Intervals: [{interval_str}], "
+                                f"Gate: {pattern.gate:.2f}"
+                            )
+
+        # Section analysis
+        if sections:
+            section_analysis = analyze_sections(song)
+            if section_analysis.sections:
+                out(f"\n  {color('Song Structure:', Colors.BOLD)}")
+
+                # Show form sequence
+                form_seq = " → ".join(section_analysis.form_sequence)
+                out(f"    Form: {form_seq}")
+
+                # Show each section
+                for section in section_analysis.sections:
+                    type_str = ""
+                    if section.type_hint != SectionType.UNKNOWN:
+                        confidence_pct = int(section.type_confidence * 100)
+                        type_str = f" ({section.type_hint.value} ~{confidence_pct}%)"
+
+                    bars_str = f"bars {section.start_bar + 1}-{section.end_bar}"
+                    out(
+                        f"    {color(section.form_label, Colors.CYAN)}: {bars_str}{type_str}"
+                    )
+    except Exception as e:
+        # The stack is only shown in verbose mode, so skip formatting it otherwise
+        stack = traceback.format_exc() if verbose else None
+        return _FileReport(file_path, "\n".join(output), str(e), stack, cached)
+
+    return _FileReport(file_path, "\n".join(output), cached=cached)
+
+
+def _submit_ahead(
+    executor: Executor,
+    fn: Callable[[Path], _T],
+    items: Iterable[Path],
+    window: int,
+) -> Iterator[tuple[Path, Future[_T]]]:
+    """Submit fn over items, keeping a bounded number of calls in flight.
+
+    Unlike Executor.map, at most ``window`` items are submitted ahead of
+    the one being yielded, so a lazy input is not read all at once.
+
+    Args:
+        executor: Executor to run on.
+        fn: Function to apply.
+        items: Inputs, consumed as futures are taken.
+        window: Maximum number of pending submissions.
+
+    Yields:
+        Each item with the future for its call, in input order.
+    """
+    pending: deque[tuple[Path, Future[_T]]] = deque()
+    for item in items:
+        pending.append((item, executor.submit(fn, item)))
+        if len(pending) >= window:
+            yield pending.popleft()
+    while pending:
+        yield pending.popleft()
+
+
+def _map_in_order(
+    executor: Executor,
+    fn: Callable[[Path], _T],
+    items: Iterable[Path],
+    window: int,
+) -> Iterator[_T]:
+    """Map over items in an executor, yielding results in input order.
+
+    Args:
+        executor: Executor to run on.
+        fn: Function to apply.
+        items: Inputs, consumed as results are taken.
+        window: Maximum number of pending submissions.
+
+    Yields:
+        Results of fn, in input order.
+    """
+    for _, future in _submit_ahead(executor, fn, items, window):
+        yield future.result()
+
 
 @cli.command()
 @click.argument("path", type=click.Path(exists=True, path_type=Path))
@@ -63,6 +391,12 @@ DEFAULT_LIBRARY = Path("midi_library.db")
 @click.option("-v", "--verbose", is_flag=True, help="Show detailed analysis output.")
 @click.option("--sections", is_flag=True, help="Include section structure analysis.")
 @click.option("--arpeggios", is_flag=True, help="Include arpeggio pattern analysis.")
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Worker processes for directories (default: CPU count).",
+)
 @click.pass_context
 def analyze(
     ctx: click.Context,
@@ -71,6 +405,7 @@ def analyze(
     verbose: bool,
     sections: bool,
     arpeggios: bool,
+    jobs: int | None,
 ) -> None:
     """Analyze MIDI files and display results.
 
@@ -83,155 +418,85 @@ def analyze(
     """
     # Use command-level verbose or parent-level verbose
     verbose = verbose or ctx.obj.get("verbose", False)
+    use_cache = ctx.obj.get("use_cache", True)
 
     if path.is_file():
-        files = [path]
+        found: Iterator[Path] = iter([path])
     else:
-        pattern = "**/*.mid" if recursive else "*.mid"
-        files = list(path.glob(pattern))
-        # Also include .midi extension
-        files.extend(path.glob(pattern.replace(".mid", ".midi")))
+        from midi_analyzer.ingest.files import iter_midi_files
 
-    if not files:
+        found = iter_midi_files(path, recursive=recursive)
+
+    # Discover files lazily: only enough for the preview is read up front,
+    # and analysis starts before the rest of the tree is scanned
+    preview = list(itertools.islice(found, 11))
+    if not preview:
         click.echo(f"No MIDI files found in {path}", err=True)
         raise SystemExit(1)
 
-    click.echo(f"Found {len(files)} MIDI file(s) to analyze")
+    if len(preview) > 10:
+        click.echo("Found more than 10 MIDI files to analyze")
+    else:
+        click.echo(f"Found {len(preview)} MIDI file(s) to analyze")
 
     if verbose:
-        for f in files[:10]:
+        for f in preview[:10]:
             click.echo(f"  - {f}")
-        if len(files) > 10:
-            click.echo(f"  ... and {len(files) - 10} more")
-
-    # Analyze files
-    from midi_analyzer.ingest import parse_midi_file
-    from midi_analyzer.harmony import detect_key_for_song, detect_chord_progression_for_song
-    from midi_analyzer.analysis import classify_track_role, FeatureExtractor
-    from midi_analyzer.analysis.sections import analyze_sections, SectionType
-    from midi_analyzer.analysis.arpeggios import analyze_arp_track
-
-    feature_extractor = FeatureExtractor()
+        if len(preview) > 10:
+            click.echo("  ... and more")
+
+    files = itertools.chain(preview, found)
+
+    # Analyze files, in parallel worker processes for directories
+    analyze_one = functools.partial(
+        _analyze_file,
+        verbose=verbose,
+        sections=sections,
+        arpeggios=arpeggios,
+        use_cache=use_cache,
+    )
+    file_count = 0
     success_count = 0
+    cache_hits = 0
     failed_files: list[tuple[Path, str]] = []
 
-    for file_path in files:
-        try:
-            song = parse_midi_file(file_path)
-            key = detect_key_for_song(song)
-
-            # Basic summary line
-            click.echo(f"\n{color(file_path.name, Colors.BOLD, Colors.CYAN)}: {key.root_name} {key.mode.value} ({len(song.tracks)} tracks)")
-
-            if verbose:
-                # Show timing info
-                click.echo(f"  Tempo: {song.primary_tempo:.1f} BPM, Time sig: {song.primary_time_sig}")
-                click.echo(f"  Duration: {song.total_beats:.1f} beats ({song.total_bars} bars)")
-
-                # Detect chord progression
-                chords = detect_chord_progression_for_song(song)
-                if chords.chords:
-                    chord_names = [c.chord.name for c in chords.chords[:8]]
-                    progression = " → ".join(chord_names)
-                    if len(chords.chords) > 8:
-                        progression += " ..."
-                    click.echo(f"  Chords: {progression}")
-
-                # Show each track with role and stats
-                click.echo(f"  Tracks:")
-                for i, track in enumerate(song.tracks):
-                    if not track.notes:
-                        continue
-
-                    # Extract features for role classification
-                    track.features = feature_extractor.extract_features(track, song.total_bars or 1)
-                    role_probs = classify_track_role(track)
-                    role = role_probs.primary_role()
-
-                    # Calculate pitch range
-                    pitches = [n.pitch for n in track.notes]
-                    pitch_range = f"{min(pitches)}-{max(pitches)}"
-
-                    # Note density
-                    if song.total_beats > 0:
-                        notes_per_beat = len(track.notes) / song.total_beats
-                    else:
-                        notes_per_beat = 0
-
-                    track_name = track.name or f"Track {i}"
-                    click.echo(
-                        f"    [{role.value:6}] {track_name}: "
-                        f"{len(track.notes)} notes, "
-                        f"pitch {pitch_range}, "
-                        f"{notes_per_beat:.1f} notes/beat"
-                    )
+    with contextlib.ExitStack() as stack:
+        if path.is_file():
+            reports: Iterator[_FileReport] = map(analyze_one, files)
+        elif jobs == 1:
+            # Serial analysis: parse upcoming files on a thread so reading
+            # them overlaps with analysis of the current one
+            load = functools.partial(_load_song, use_cache=use_cache)
+            parser = stack.enter_context(ThreadPoolExecutor(max_workers=1))
+            reports = (
+                analyze_one(f, parsed=parsed)
+                for f, parsed in _submit_ahead(parser, load, files, window=8)
+            )
+        else:
+            workers = jobs or os.cpu_count() or 1
+            executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+            reports = _map_in_order(executor, analyze_one, files, window=workers * 4)
+
+        for report in reports:
+            file_count += 1
+            cache_hits += report.cached
+            if report.output:
+                click.echo(report.output)
+
+            if report.error is None:
+                success_count += 1
+                continue
 
-                    # Show note distribution for drums
-                    if role == TrackRole.DRUMS and verbose:
-                        # Count notes by pitch (drum sounds)
-                        from collections import Counter
-                        drum_counts = Counter(n.pitch for n in track.notes)
-                        top_drums = drum_counts.most_common(3)
-                        drum_names = {
-                            36: "kick", 38: "snare", 42: "hihat-c",
-                            46: "hihat-o", 41: "tom-lo", 45: "tom-mid",
-                            48: "tom-hi", 49: "crash", 51: "ride",
-                        }
-                        top_str = ", ".join(
-                            f"{drum_names.get(p, f'n{p}')}:{c}"
-                            for p, c in top_drums
-                        )
-                        click.echo(f"             Top hits: {top_str}")
-
-                    # Show arpeggio analysis for arp tracks
-                    if arpeggios and role == TrackRole.ARP:
-                        track.role_probs = role_probs
-                        arp_analysis = analyze_arp_track(track, song)
-                        if arp_analysis.patterns:
-                            click.echo(f"             {color('Arpeggio patterns:', Colors.GREEN)}")
-                            for j, pattern in enumerate(arp_analysis.patterns[:3]):
-                                intervals = pattern.interval_sequence[:4]
-                                interval_str = " ".join(str(i) for i in intervals)
-                                click.echo(
-                                    f"               [{j+1}] Rate: {pattern.rate}, "
-                                    f"Intervals: [{interval_str}], "
-                                    f"Gate: {pattern.gate:.2f}"
-                                )
-
-            # Section analysis
-            if sections:
-                section_analysis = analyze_sections(song)
-                if section_analysis.sections:
-                    click.echo(f"\n  {color('Song Structure:', Colors.BOLD)}")
-
-                    # Show form sequence
-                    form_seq = " → ".join(section_analysis.form_sequence)
-                    click.echo(f"    Form: {form_seq}")
-
-                    # Show each section
-                    for section in section_analysis.sections:
-                        type_str = ""
-                        if section.type_hint != SectionType.UNKNOWN:
-                            confidence_pct = int(section.type_confidence * 100)
-                            type_str = f" ({section.type_hint.value} ~{confidence_pct}%)"
-
-                        bars_str = f"bars {section.start_bar + 1}-{section.end_bar}"
-                        click.echo(
-                            f"    {color(section.form_label, Colors.CYAN)}: {bars_str}{type_str}"
-                        )
-
-            success_count += 1
-
-        except Exception as e:
-            failed_files.append((file_path, str(e)))
+            failed_files.append((report.path, report.error))
             if verbose:
-                click.echo(f"\nError processing {file_path}: {e}", err=True)
-                import traceback
-                click.echo(traceback.format_exc(), err=True)
+                click.echo(f"\nError processing {report.path}: {report.error}", err=True)
+                click.echo(report.traceback, err=True)
 
     # Summary
     click.echo(f"\n{'=' * 60}")
-    click.echo(f"Processed {success_count}/{len(files)} files successfully")
+    click.echo(f"Processed {success_count}/{file_count} files successfully")
+    if verbose and use_cache:
+        click.echo(f"Loaded {cache_hits}/{file_count} files from the song cache")
 
     if failed_files:
         click.echo(f"\nFailed to process {len(failed_files)} file(s):")
@@ -255,7 +520,6 @@ def structure(ctx: click.Context, path: Path, verbose: bool, output_format: str)
         midi-analyzer structure song.mid
         midi-analyzer structure song.mid --format json
     """
-    from midi_analyzer.ingest import parse_midi_file
     from midi_analyzer.harmony import detect_key_for_song
     from midi_analyzer.analysis.sections import analyze_sections, SectionType
 
@@ -266,13 +530,16 @@ def structure(ctx: click.Context, path: Path, verbose: bool, output_format: str)
         raise SystemExit(1)
 
     try:
-        song = parse_midi_file(path)
+        song, cached = _load_song(path, ctx.obj.get("use_cache", True))
         key = detect_key_for_song(song)
         analysis = analyze_sections(song)
     except Exception as e:
         click.echo(f"Error analyzing {path}: {e}", err=True)
         raise SystemExit(1)
 
+    if verbose and cached:
+        click.echo(f"Loaded {path.name} from the song cache", err=True)
+
     if output_format == "json":
         # JSON output for programmatic use
         data = {
@@ -306,7 +573,7 @@ def structure(ctx: click.Context, path: Path, verbose: bool, output_format: str)
                 }
                 for bf in analysis.bar_features
             ]
-        click.echo(json.dumps(data, indent=2))
+        click.echo(_to_json(data))
         return
 
     # Text output
@@ -380,8 +647,7 @@ def arpeggios(ctx: click.Context, path: Path, track: int | None, output_format:
         midi-analyzer arpeggios song.mid --track 2
         midi-analyzer arpeggios song.mid --format json
     """
-    from midi_analyzer.ingest import parse_midi_file
-    from midi_analyzer.analysis import classify_track_role, FeatureExtractor
+    from midi_analyzer.analysis import classify_track_roles, FeatureExtractor
     from midi_analyzer.analysis.arpeggios import analyze_arp_track
 
     verbose = verbose or ctx.obj.get("verbose", False)
@@ -391,28 +657,38 @@ def arpeggios(ctx: click.Context, path: Path, track: int | None, output_format:
         raise SystemExit(1)
 
     try:
-        song = parse_midi_file(path)
+        song, cached = _load_song(path, ctx.obj.get("use_cache", True))
     except Exception as e:
         click.echo(f"Error loading {path}: {e}", err=True)
         raise SystemExit(1)
 
+    if verbose and cached:
+        click.echo(f"Loaded {path.name} from the song cache", err=True)
+
     feature_extractor = FeatureExtractor()
 
-    # Analyze tracks and find arp candidates
-    arp_tracks = []
-    for i, t in enumerate(song.tracks):
-        if not t.notes:
-            continue
+    # Pick the tracks to classify: the requested one, or every track that
+    # could be an arp (the drum channel only ever scores as drums)
+    if track is not None:
+        candidates = [(i, t) for i, t in enumerate(song.tracks) if i == track and t.notes]
+    else:
+        candidates = [
+            (i, t)
+            for i, t in enumerate(song.tracks)
+            if t.notes and not (t.note_arrays["channel"] == 9).any()
+        ]
 
+    for _, t in candidates:
         t.features = feature_extractor.extract_features(t, song.total_bars or 1)
-        role_probs = classify_track_role(t)
+    all_role_probs = classify_track_roles([t for _, t in candidates])
+
+    # Analyze tracks and find arp candidates
+    arp_tracks = []
+    for (i, t), role_probs in zip(candidates, all_role_probs, strict=True):
         t.role_probs = role_probs
 
         # If specific track requested, use it; otherwise filter by arp probability
-        if track is not None:
-            if i == track:
-                arp_tracks.append((i, t, role_probs))
-        elif role_probs.arp > 0.3:  # Threshold for arp-like tracks
+        if track is not None or role_probs.arp > 0.3:  # Threshold for arp-like tracks
             arp_tracks.append((i, t, role_probs))
 
     if not arp_tracks:
@@ -423,26 +699,26 @@ def arpeggios(ctx: click.Context, path: Path, track: int | None, output_format:
             click.echo("Use --track N to analyze a specific track.")
         raise SystemExit(1)
 
-    results = []
-    for track_idx, t, role_probs in arp_tracks:
-        analysis = analyze_arp_track(t, song)
-        results.append({
-            "track_index": track_idx,
-            "track_name": t.name or f"Track {track_idx}",
-            "arp_probability": role_probs.arp,
-            "analysis": analysis,
-        })
+    results = [
+        _ArpResult(
+            track_index=track_idx,
+            track_name=t.name or f"Track {track_idx}",
+            arp_probability=role_probs.arp,
+            analysis=analyze_arp_track(t, song),
+        )
+        for track_idx, t, role_probs in arp_tracks
+    ]
 
     if output_format == "json":
         data = {
             "file": str(path),
             "tracks": [
                 {
-                    "track_index": r["track_index"],
-                    "track_name": r["track_name"],
-                    "arp_probability": r["arp_probability"],
-                    "dominant_rate": r["analysis"].dominant_rate,
-                    "avg_gate": r["analysis"].avg_gate,
+                    "track_index": r.track_index,
+                    "track_name": r.track_name,
+                    "arp_probability": r.arp_probability,
+                    "dominant_rate": r.analysis.dominant_rate,
+                    "avg_gate": r.analysis.avg_gate,
                     "patterns": [
                         {
                             "rate": p.rate,
@@ -450,7 +726,7 @@ def arpeggios(ctx: click.Context, path: Path, track: int | None, output_format:
                             "octave_jumps": p.octave_jumps,
                             "gate": p.gate,
                         }
-                        for p in r["analysis"].patterns
+                        for p in r.analysis.patterns
                     ],
                     "windows": [
                         {
@@ -460,13 +736,13 @@ def arpeggios(ctx: click.Context, path: Path, track: int | None, output_format:
                             "rate": w.rate,
                             "interval_sequence": w.interval_sequence[:8],
                         }
-                        for w in r["analysis"].windows
+                        for w in r.analysis.windows
                     ] if verbose else [],
                 }
                 for r in results
             ],
         }
-        click.echo(json.dumps(data, indent=2))
+        click.echo(_to_json(data))
         return
 
     # Text output
@@ -475,9 +751,9 @@ def arpeggios(ctx: click.Context, path: Path, track: int | None, output_format:
     click.echo(f"File: {path.name}")
 
     for r in results:
-        analysis = r["analysis"]
-        click.echo(f"\n{color(r['track_name'], Colors.CYAN, Colors.BOLD)}")
-        click.echo(f"  Arp probability: {r['arp_probability']:.0%}")
+        analysis = r.analysis
+        click.echo(f"\n{color(r.track_name, Colors.CYAN, Colors.BOLD)}")
+        click.echo(f"  Arp probability: {r.arp_probability:.0%}")
         click.echo(f"  Dominant rate: {color(analysis.dominant_rate, Colors.GREEN)}")
         click.echo(f"  Average gate: {analysis.avg_gate:.2f}")
 
@@ -530,6 +806,12 @@ def library() -> None:
     help="Library database path.",
 )
 @click.option("-v", "--verbose", is_flag=True, help="Show progress during indexing.")
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    help="Worker processes for directories (default: CPU count).",
+)
 @click.pass_context
 def library_index(
     ctx: click.Context,
@@ -540,6 +822,7 @@ def library_index(
     tag: tuple[str, ...],
     database: Path,
     verbose: bool,
+    jobs: int | None,
 ) -> None:
     """Index MIDI files into the clip library.
 
@@ -573,15 +856,29 @@ def library_index(
                 if verbose:
                     click.echo(f"  Error: {file_path.name}: {error}", err=True)
 
-            count = library.index_directory(
-                path,
-                recursive=recursive,
-                genres=list(genre) if genre else None,
-                artist=artist,
-                tags=list(tag) if tag else None,
-                progress_callback=progress if verbose else None,
-                error_callback=on_error,
-            )
+            with contextlib.ExitStack() as stack:
+                target = library
+                if library.connection.execute("SELECT 1 FROM clips LIMIT 1").fetchone():
+                    # Index into a staging database and merge it in one
+                    # transaction, so readers of a library already in use
+                    # never see a partly indexed directory
+                    staging_dir = stack.enter_context(
+                        tempfile.TemporaryDirectory(dir=database.resolve().parent)
+                    )
+                    target = stack.enter_context(ClipLibrary(Path(staging_dir) / "staging.db"))
+
+                count = target.index_directory(
+                    path,
+                    recursive=recursive,
+                    genres=list(genre) if genre else None,
+                    artist=artist,
+                    tags=list(tag) if tag else None,
+                    progress_callback=progress if verbose else None,
+                    error_callback=on_error,
+                    workers=jobs or os.cpu_count() or 1,
+                )
+                if target is not library:
+                    library.merge_from(target.db_path)
             click.echo(f"\nIndexed {count} clip(s) from {path}")
 
             if failed_files:
@@ -626,7 +923,7 @@ def library_query(
     """
     from midi_analyzer.library import ClipLibrary, ClipQuery
 
-    with ClipLibrary(database) as library:
+    with ClipLibrary(database, read_only=True) as library:
         query = ClipQuery(
             role=TrackRole(role) if role else None,
             genre=genre,
@@ -639,22 +936,21 @@ def library_query(
             limit=limit,
         )
 
-        clips = library.query(query)
+        def entries() -> Iterator[str]:
+            for clip in library.iter_query(query):
+                genres_str = ", ".join(clip.genres) if clip.genres else "none"
+                yield (
+                    f"  {clip.clip_id}: {clip.track_name or 'Untitled'}\n"
+                    f"    Role: {clip.role.value}, Notes: {clip.note_count}, Bars: {clip.duration_bars}\n"
+                    f"    Artist: {clip.artist or 'Unknown'}, Genres: {genres_str}\n"
+                    f"    Source: {os.path.basename(clip.source_path)}\n"
+                )
 
-        if not clips:
+        count = _echo_batched(entries())
+        if count:
+            click.echo(f"Found {count} clip(s).")
+        else:
             click.echo("No clips found matching criteria.")
-            return
-
-        click.echo(f"Found {len(clips)} clip(s):\n")
-
-        for clip in clips:
-            genres_str = ", ".join(clip.genres) if clip.genres else "none"
-            click.echo(
-                f"  {clip.clip_id}: {clip.track_name or 'Untitled'}\n"
-                f"    Role: {clip.role.value}, Notes: {clip.note_count}, Bars: {clip.duration_bars}\n"
-                f"    Artist: {clip.artist or 'Unknown'}, Genres: {genres_str}\n"
-                f"    Source: {Path(clip.source_path).name}\n"
-            )
 
 
 @library.command("export")
@@ -688,17 +984,13 @@ def library_export(
     from midi_analyzer.export import ExportOptions, export_track
     from midi_analyzer.library import ClipLibrary, ClipQuery
 
-    with ClipLibrary(database) as library:
+    with ClipLibrary(database, read_only=True) as library:
         # Find the clip
-        cursor = library.connection.cursor()
-        cursor.execute("SELECT * FROM clips WHERE clip_id = ?", (clip_id,))
-        row = cursor.fetchone()
-
-        if not row:
+        clip = library.get_clip(clip_id)
+        if clip is None:
             click.echo(f"Clip '{clip_id}' not found.", err=True)
             raise SystemExit(1)
 
-        clip = library._row_to_clip(row)
         track = library.load_track(clip)
 
         # Determine output path
@@ -727,7 +1019,7 @@ def library_stats(ctx: click.Context, database: Path) -> None:
     """Show library statistics."""
     from midi_analyzer.library import ClipLibrary
 
-    with ClipLibrary(database) as library:
+    with ClipLibrary(database, read_only=True) as library:
         stats = library.get_stats()
 
         click.echo(f"Library Statistics ({database}):\n")
@@ -741,7 +1033,8 @@ def library_stats(ctx: click.Context, database: Path) -> None:
 
         if stats.clips_by_genre:
             click.echo("\n  Top genres:")
-            top_genres = sorted(stats.clips_by_genre.items(), key=lambda x: -x[1])[:10]
+            # Already ordered by count
+            top_genres = itertools.islice(stats.clips_by_genre.items(), 10)
             for genre, count in top_genres:
                 click.echo(f"    {genre}: {count}")
 
@@ -764,7 +1057,7 @@ def library_list_genres(database: Path) -> None:
     """List all genres in the library."""
     from midi_analyzer.library import ClipLibrary
 
-    with ClipLibrary(database) as library:
+    with ClipLibrary(database, read_only=True) as library:
         genres = library.list_genres()
 
         if not genres:
@@ -787,7 +1080,7 @@ def library_list_artists(database: Path) -> None:
     """List all artists in the library."""
     from midi_analyzer.library import ClipLibrary
 
-    with ClipLibrary(database) as library:
+    with ClipLibrary(database, read_only=True) as library:
         artists = library.list_artists()
 
         if not artists:
@@ -863,12 +1156,10 @@ def library_enrich(ctx: click.Context, database: Path, dry_run: bool) -> None:
 
                 if tags and not dry_run:
                     # Update all clips by this artist
-                    cursor = lib.connection.cursor()
-                    cursor.execute(
+                    rows = lib.connection.execute(
                         "SELECT clip_id, genres FROM clips WHERE artist = ?",
                         (artist,),
-                    )
-                    rows = cursor.fetchall()
+                    ).fetchall()
 
                     for row in rows:
                         clip_id = row[0]
@@ -880,12 +1171,10 @@ def library_enrich(ctx: click.Context, database: Path, dry_run: bool) -> None:
 
                 elif tags:
                     # Dry run - count what would be updated
-                    cursor = lib.connection.cursor()
-                    cursor.execute(
+                    count = lib.connection.execute(
                         "SELECT COUNT(*) FROM clips WHERE artist = ?",
                         (artist,),
-                    )
-                    count = cursor.fetchone()[0]
+                    ).fetchone()[0]
                     updated_count += count
 
             except Exception as e:
@@ -936,7 +1225,7 @@ def search(
 
     verbose = ctx.obj.get("verbose", False)
 
-    with ClipLibrary(database) as library:
+    with ClipLibrary(database, read_only=True) as library:
         query = ClipQuery(
             role=TrackRole(role) if role else None,
             genre=genre,
@@ -944,22 +1233,19 @@ def search(
             limit=limit,
         )
 
-        clips = library.query(query)
-
-        if not clips:
+        def entries() -> Iterator[str]:
+            for clip in library.iter_query(query):
+                artist_str = f" by {clip.artist}" if clip.artist else ""
+                entry = f"  {clip.clip_id}: {clip.track_name or 'Untitled'} [{clip.role.value}]{artist_str}"
+                if verbose and clip.genres:
+                    entry += f"\n    Genres: {', '.join(clip.genres)}"
+                yield entry
+
+        count = _echo_batched(entries())
+        if count:
+            click.echo(f"\nFound {count} pattern(s).")
+        else:
             click.echo("No patterns found matching criteria.")
-            return
-
-        click.echo(f"Found {len(clips)} pattern(s):\n")
-
-        for clip in clips:
-            genres_str = ", ".join(clip.genres) if clip.genres else ""
-            artist_str = f" by {clip.artist}" if clip.artist else ""
-            click.echo(
-                f"  {clip.clip_id}: {clip.track_name or 'Untitled'} [{clip.role.value}]{artist_str}"
-            )
-            if verbose and genres_str:
-                click.echo(f"    Genres: {genres_str}")
 
 
 @cli.command()
@@ -979,7 +1265,7 @@ def stats(ctx: click.Context, database: Path) -> None:
     # Delegate to library stats
     from midi_analyzer.library import ClipLibrary
 
-    with ClipLibrary(database) as library:
+    with ClipLibrary(database, read_only=True) as library:
         stats_info = library.get_stats()
 
         click.echo(f"Library: {database}\n")
@@ -1031,22 +1317,16 @@ def export(
 
     CLIP_ID is the clip identifier (use 'search' or 'library query' to find IDs).
     """
-    import json
-
     from midi_analyzer.export import ExportOptions, export_track
     from midi_analyzer.library import ClipLibrary
 
-    with ClipLibrary(database) as library:
+    with ClipLibrary(database, read_only=True) as library:
         # Find the clip
-        cursor = library.connection.cursor()
-        cursor.execute("SELECT * FROM clips WHERE clip_id = ?", (clip_id,))
-        row = cursor.fetchone()
-
-        if not row:
+        clip = library.get_clip(clip_id)
+        if clip is None:
             click.echo(f"Clip '{clip_id}' not found.", err=True)
             raise SystemExit(1)
 
-        clip = library._row_to_clip(row)
         track = library.load_track(clip)
 
         if output_format == "json":
@@ -1068,11 +1348,12 @@ def export(
                     for n in track.notes
                 ],
             }
+            text = _to_json(data)
             if output:
-                output.write_text(json.dumps(data, indent=2))
+                output.write_text(text, encoding="utf-8")
                 click.echo(f"Exported to {output}")
             else:
-                click.echo(json.dumps(data, indent=2))
+                click.echo(text)
         else:
             # Export as MIDI
             if output is None:
@@ -1139,11 +1420,9 @@ def play(
     is_file = source_path.exists() and source_path.suffix.lower() in (".mid", ".midi")
 
     if is_file:
-        # Play MIDI file directly
-        from midi_analyzer.ingest import parse_midi_file
-
+        # Play MIDI file directly, reusing the parse from an earlier run
         click.echo(f"Loading {source_path.name}...")
-        song = parse_midi_file(source_path)
+        song, _ = _load_song(source_path, ctx.obj.get("use_cache", True))
 
         # Use song's tempo if not overridden
         if tempo == 120.0 and song.primary_tempo != 120.0:
@@ -1159,14 +1438,18 @@ def play(
             instrument=instrument,
         )
 
+        # Classify all tracks up front, outside the playback loop
+        from midi_analyzer.analysis import FeatureExtractor, classify_track_roles
+
+        feature_extractor = FeatureExtractor()
+        note_tracks = [(i, t) for i, t in enumerate(song.tracks) if t.notes]
+        for _, track in note_tracks:
+            track.features = feature_extractor.extract_features(track, song.total_bars or 1)
+        roles = [p.primary_role() for p in classify_track_roles([t for _, t in note_tracks])]
+
         try:
             with MidiPlayer() as player:
-                for i, track in enumerate(song.tracks):
-                    if not track.notes:
-                        continue
-
-                    from midi_analyzer.analysis.roles import classify_track_role
-                    role = classify_track_role(track)
+                for (i, track), role in zip(note_tracks, roles, strict=True):
                     prog = instrument if instrument is not None else get_instrument_for_role(role)
                     inst_name = get_instrument_name(prog) if role.value != "drums" else "Drums"
 
@@ -1179,16 +1462,12 @@ def play(
         # Try to play from library
         from midi_analyzer.library import ClipLibrary
 
-        with ClipLibrary(database) as library:
-            cursor = library.connection.cursor()
-            cursor.execute("SELECT * FROM clips WHERE clip_id = ?", (source,))
-            row = cursor.fetchone()
-
-            if not row:
+        with ClipLibrary(database, read_only=True) as library:
+            clip = library.get_clip(source)
+            if clip is None:
                 click.echo(f"'{source}' is not a valid file or clip ID.", err=True)
                 raise SystemExit(1)
 
-            clip = library._row_to_clip(row)
             track = library.load_track(clip)
 
             # Get instrument for role
@@ -47,6 +47,15 @@ CHORD_TEMPLATES: dict[ChordQuality, frozenset[int]] = {
     ChordQuality.POWER: frozenset({0, 7}),
 }
 
+# Chord templates as (quality, 12-bit interval mask, template size)
+CHORD_TEMPLATE_BITS: list[tuple[ChordQuality, int, int]] = [
+    (quality, bits, bits.bit_count())
+    for quality, bits in (
+        (quality, sum(1 << pc for pc in template))
+        for quality, template in CHORD_TEMPLATES.items()
+    )
+]
+
 # Pitch class names
 PITCH_CLASSES = ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")
 
@@ -2,6 +2,7 @@
 
 from pathlib import Path
 
+from midi_analyzer.ingest.files import MIDI_EXTENSIONS, iter_midi_files
 from midi_analyzer.ingest.metadata import MetadataExtractor
 from midi_analyzer.ingest.parser import MidiParser
 from midi_analyzer.ingest.timing import (
@@ -36,4 +37,6 @@ __all__ = [
     "detect_swing",
     "detect_song_swing",
     "parse_midi_file",
+    "MIDI_EXTENSIONS",
+    "iter_midi_files",
 ]
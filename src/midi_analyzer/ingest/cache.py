@@ -0,0 +1,132 @@
+"""On-disk cache of parsed songs."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import itertools
+import os
+import pickle
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from midi_analyzer import __version__
+from midi_analyzer.ingest.parser import MidiParser
+
+if TYPE_CHECKING:
+    from midi_analyzer.models.core import Song
+
+# Most entries kept in a cache directory; the least recently used go first
+MAX_CACHE_ENTRIES = 2000
+# Writes between checks of the entry count; the first write in a process
+# always checks, so the cache overshoots the bound by at most this many
+PRUNE_INTERVAL = 100
+
+_writes = itertools.count()
+
+
+def default_cache_dir() -> Path:
+    """Get the directory for cached songs.
+
+    Returns:
+        Path under $XDG_CACHE_HOME, or ~/.cache if it is not set.
+    """
+    base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "midi-analyzer" / "songs"
+
+
+def parse_midi_file_cached(file_path: Path | str, cache_dir: Path | str | None = None) -> Song:
+    """Parse a MIDI file, reusing an earlier parse of the same file.
+
+    Cache entries are keyed on the file's contents, its resolved path and
+    the package version, so an edited or moved file, or an upgrade, is
+    parsed afresh. Unreadable cache entries are ignored and cache write
+    failures are not reported. At most MAX_CACHE_ENTRIES entries are kept;
+    deleting the cache directory clears it.
+
+    Args:
+        file_path: Path to the MIDI file.
+        cache_dir: Cache directory (default: default_cache_dir()).
+
+    Returns:
+        Parsed Song object.
+    """
+    return load_song(file_path, cache_dir)[0]
+
+
+def load_song(file_path: Path | str, cache_dir: Path | str | None = None) -> tuple[Song, bool]:
+    """Parse a MIDI file through the cache, reporting whether it was cached.
+
+    Args:
+        file_path: Path to the MIDI file.
+        cache_dir: Cache directory (default: default_cache_dir()).
+
+    Returns:
+        Tuple of (parsed Song, whether it was loaded from the cache).
+    """
+    file_path = Path(file_path).resolve()
+    cache_dir = Path(cache_dir) if cache_dir is not None else default_cache_dir()
+
+    seed = hashlib.blake2b(f"{__version__}\0{file_path}\0".encode(), digest_size=16)
+    with open(file_path, "rb") as f:
+        # file_digest hashes through a reused buffer rather than a full copy
+        key = hashlib.file_digest(f, lambda: seed).hexdigest()
+    cache_path = cache_dir / f"{key}.pkl"
+
+    try:
+        with open(cache_path, "rb") as f:
+            song = pickle.load(f)
+    except (OSError, pickle.PickleError, EOFError, AttributeError, ImportError):
+        pass
+    else:
+        # Mark the entry as recently used, for pruning
+        with contextlib.suppress(OSError):
+            os.utime(cache_path)
+        return song, True
+
+    song = MidiParser().parse_file(file_path)
+
+    # Write through a temporary file so readers never see a partial entry
+    try:
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+    except OSError:
+        return song, False
+
+    try:
+        with os.fdopen(fd, "wb") as f:
+            pickle.dump(song, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_name, cache_path)
+        if next(_writes) % PRUNE_INTERVAL == 0:
+            _prune(cache_dir)
+    except BaseException as e:
+        with contextlib.suppress(OSError):
+            os.unlink(tmp_name)
+        # Any failure to write the entry, pickling included, only loses the
+        # cache entry; interrupts still propagate
+        if not isinstance(e, Exception):
+            raise
+
+    return song, False
+
+
+def _prune(cache_dir: Path) -> None:
+    """Delete the least recently used entries beyond MAX_CACHE_ENTRIES."""
+    # Counting names is much cheaper than stat-ing every entry
+    if len(os.listdir(cache_dir)) <= MAX_CACHE_ENTRIES:
+        return
+
+    with os.scandir(cache_dir) as entries:
+        cached = [
+            (entry.stat().st_mtime_ns, entry.path)
+            for entry in entries
+            if entry.name.endswith(".pkl")
+        ]
+    if len(cached) <= MAX_CACHE_ENTRIES:
+        return
+
+    cached.sort()
+    for _, path in cached[: len(cached) - MAX_CACHE_ENTRIES]:
+        with contextlib.suppress(OSError):
+            os.unlink(path)
@@ -0,0 +1,129 @@
+"""MIDI file discovery."""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+# File extensions treated as MIDI files
+MIDI_EXTENSIONS = (".mid", ".midi")
+
+# Whether directories can be opened and scanned relative to a parent fd
+_HAS_DIR_FD = os.scandir in os.supports_fd and os.open in os.supports_dir_fd
+_DIR_FLAGS = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0)
+
+
+def iter_midi_files(
+    root: Path | str,
+    recursive: bool = False,
+    extensions: tuple[str, ...] = MIDI_EXTENSIONS,
+) -> Iterator[Path]:
+    """Yield MIDI files in a directory.
+
+    Walks the tree once with os.scandir, matching every extension in the
+    same pass. Directory entries are classified from the scan itself, so
+    no extra stat call is made per entry. Unreadable directories are
+    skipped, as with Path.glob.
+
+    Where supported, subdirectories are opened relative to their parent's
+    file descriptor, so the kernel never re-resolves the full path of a
+    deep directory.
+
+    Args:
+        root: Directory to scan.
+        recursive: Whether to descend into subdirectories.
+        extensions: File name suffixes to include, matched case-insensitively.
+
+    Yields:
+        Paths of matching files.
+    """
+    suffixes = tuple(ext.lower() for ext in extensions)
+    if _HAS_DIR_FD:
+        yield from _iter_by_fd(os.fspath(root), recursive, suffixes)
+    else:
+        yield from _iter_by_path(os.fspath(root), recursive, suffixes)
+
+
+def _iter_by_path(root: str, recursive: bool, suffixes: tuple[str, ...]) -> Iterator[Path]:
+    """Walk the tree by full path names."""
+    pending = [root]
+    while pending:
+        directory = pending.pop()
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            continue
+
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        pending.append(entry.path)
+                elif entry.name.lower().endswith(suffixes) and entry.is_file():
+                    yield Path(entry.path)
+
+
+def _scan_fd(fd: int, suffixes: tuple[str, ...]) -> tuple[list[str], list[str]]:
+    """List matching file names and subdirectory names of an open directory."""
+    files: list[str] = []
+    subdirs: list[str] = []
+    with os.scandir(fd) as entries:
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                subdirs.append(entry.name)
+            elif entry.name.lower().endswith(suffixes) and entry.is_file():
+                files.append(entry.name)
+    return files, subdirs
+
+
+def _iter_by_fd(root: str, recursive: bool, suffixes: tuple[str, ...]) -> Iterator[Path]:
+    """Walk the tree opening each directory relative to its parent.
+
+    At most one descriptor per directory level is open at a time.
+    """
+    try:
+        root_fd = os.open(root, _DIR_FLAGS)
+    except OSError:
+        return
+
+    # (fd, path, subdirectory names still to visit) per open directory level
+    stack: list[tuple[int, str, list[str]]] = []
+    try:
+        try:
+            files, subdirs = _scan_fd(root_fd, suffixes)
+        except OSError:
+            files, subdirs = [], []
+        stack.append((root_fd, root, subdirs if recursive else []))
+        for name in files:
+            yield Path(root, name)
+
+        while stack:
+            fd, path, subdirs = stack[-1]
+            if not subdirs:
+                os.close(fd)
+                stack.pop()
+                continue
+
+            name = subdirs.pop()
+            try:
+                child_fd = os.open(name, _DIR_FLAGS, dir_fd=fd)
+            except OSError:
+                continue
+
+            child_path = os.path.join(path, name)
+            try:
+                files, child_subdirs = _scan_fd(child_fd, suffixes)
+            except OSError:
+                os.close(child_fd)
+                continue
+
+            stack.append((child_fd, child_path, child_subdirs))
+            for file_name in files:
+                yield Path(child_path, file_name)
+    finally:
+        for fd, _, _ in stack:
+            os.close(fd)
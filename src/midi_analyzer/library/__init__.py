@@ -2,21 +2,28 @@
 
 from __future__ import annotations
 
+import contextlib
+import functools
 import json
 import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, TypeVar
 
 from midi_analyzer.analysis.features import FeatureExtractor
-from midi_analyzer.analysis.roles import classify_track_role
-from midi_analyzer.ingest import parse_midi_file
+from midi_analyzer.analysis.roles import classify_track_roles
+from midi_analyzer.ingest import iter_midi_files, parse_midi_file
 from midi_analyzer.ingest.metadata import MetadataExtractor
 from midi_analyzer.metadata.genres import GenreNormalizer, GenreResult, normalize_tag
 from midi_analyzer.models.core import Song, Track, TrackRole
 
 if TYPE_CHECKING:
-    from collections.abc import Callable, Iterator
+    from collections.abc import Callable, Iterable, Iterator
+    from concurrent.futures import Executor, Future
+
+_T = TypeVar("_T")
 
 
 @dataclass
@@ -93,7 +100,7 @@ class IndexStats:
         total_clips: Total number of indexed clips.
         total_songs: Total number of indexed songs.
         clips_by_role: Count of clips per role.
-        clips_by_genre: Count of clips per genre.
+        clips_by_genre: Count of clips per genre, most common first.
         artists: List of unique artists.
     """
 
@@ -121,19 +128,41 @@ class ClipLibrary:
         export_track(track, "bass_clip.mid")
     """
 
-    def __init__(self, db_path: Path | str) -> None:
+    # Clip rows written per insert and transaction in index_directory
+    INSERT_BATCH_SIZE = 500
+
+    def __init__(self, db_path: Path | str, *, read_only: bool = False) -> None:
         """Initialize the clip library.
 
         Args:
             db_path: Path to the SQLite database.
+            read_only: Open an existing database for reading only. The schema
+                is neither created nor migrated, and no write locks are taken.
         """
         self.db_path = Path(db_path)
-        self.connection = sqlite3.connect(self.db_path)
+        self.read_only = read_only
+        if read_only:
+            uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+            self.connection = sqlite3.connect(uri, uri=True)
+        else:
+            self.connection = sqlite3.connect(self.db_path)
         self.connection.row_factory = sqlite3.Row
-        # Use WAL mode for better concurrent access
-        self.connection.execute("PRAGMA journal_mode=WAL")
+        self._configure_connection()
         self._genre_normalizer = GenreNormalizer()
-        self._init_schema()
+        if not read_only:
+            self._init_schema()
+
+    def _configure_connection(self) -> None:
+        """Apply connection-level performance settings."""
+        execute = self.connection.execute
+        if not self.read_only:
+            # Use WAL mode for better concurrent access
+            execute("PRAGMA journal_mode=WAL")
+            # Safe with WAL: commits no longer wait on fsync
+            execute("PRAGMA synchronous=NORMAL")
+        execute("PRAGMA cache_size=-20000")  # ~20 MB page cache
+        execute("PRAGMA temp_store=MEMORY")
+        execute("PRAGMA mmap_size=268435456")  # 256 MB
 
     def _init_schema(self) -> None:
         """Initialize database schema."""
@@ -158,8 +187,14 @@ class ClipLibrary:
             )
         """)
 
+        # (role, note_count) serves role filters and the note_count ordering
+        # of query(); it supersedes the older single-column role index
+        cursor.execute("DROP INDEX IF EXISTS idx_clips_role")
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_clips_role_notes ON clips(role, note_count)
+        """)
         cursor.execute("""
-            CREATE INDEX IF NOT EXISTS idx_clips_role ON clips(role)
+            CREATE INDEX IF NOT EXISTS idx_clips_notes ON clips(note_count)
         """)
         cursor.execute("""
             CREATE INDEX IF NOT EXISTS idx_clips_artist ON clips(artist)
@@ -178,6 +213,9 @@ class ClipLibrary:
 
     def close(self) -> None:
         """Close the database connection."""
+        if not self.read_only:
+            # Refresh query planner statistics where they have gone stale
+            self.connection.execute("PRAGMA optimize")
         self.connection.close()
 
     def __enter__(self) -> ClipLibrary:
@@ -251,86 +289,21 @@ class ClipLibrary:
         Returns:
             List of indexed clips.
         """
-        file_path = Path(file_path)
-        song = parse_midi_file(file_path)
-
-        # Extract metadata from filename/path if not provided
-        extractor = MetadataExtractor()
-        metadata = extractor.extract(file_path)
-        if not artist:
-            artist = metadata.artist or ""
-        if not title:
-            title = metadata.title or ""
-
-        # Normalize genres
-        normalized_genres = []
-        if genres:
-            for g in genres:
-                canonical = normalize_tag(g)
-                if canonical and canonical not in normalized_genres:
-                    normalized_genres.append(canonical)
-
-        clips = []
-        cursor = self.connection.cursor()
-        feature_extractor = FeatureExtractor()
-
-        for track in song.tracks:
-            if not track.notes:
-                continue
-
-            # Extract features and classify role
-            track.features = feature_extractor.extract_features(track, song.total_bars or 1)
-            role_probs = classify_track_role(track)
-            role = role_probs.primary_role()
-
-            # Generate clip ID
-            clip_id = f"{song.song_id}_{track.track_id}"
-
-            clip = ClipInfo(
-                clip_id=clip_id,
-                song_id=song.song_id,
-                track_id=track.track_id,
-                source_path=str(file_path.resolve()),
-                track_name=track.name,
-                role=role,
-                channel=track.channel,
-                note_count=len(track.notes),
-                duration_bars=song.total_bars,
-                genres=normalized_genres,
-                artist=artist,
-                title=title,
-                tags=tags or [],
-            )
-
-            # Insert into database
-            cursor.execute(
-                """INSERT OR REPLACE INTO clips
-                   (clip_id, song_id, track_id, source_path, track_name,
-                    role, channel, note_count, duration_bars, genres, artist, title, tags)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    clip.clip_id,
-                    clip.song_id,
-                    clip.track_id,
-                    clip.source_path,
-                    clip.track_name,
-                    clip.role.value,
-                    clip.channel,
-                    clip.note_count,
-                    clip.duration_bars,
-                    json.dumps(clip.genres),
-                    clip.artist,
-                    clip.title,
-                    json.dumps(clip.tags),
-                ),
-            )
-
-            clips.append(clip)
-
+        clips, rows = _index_file(file_path, genres=genres, artist=artist, title=title, tags=tags)
+        self._insert_rows(rows)
         self.connection.commit()
-
         return clips
 
+    def _insert_rows(self, rows: list[tuple]) -> None:
+        """Insert or replace clip rows built by _index_file, without committing."""
+        self.connection.executemany(
+            """INSERT OR REPLACE INTO clips
+               (clip_id, song_id, track_id, source_path, track_name,
+                role, channel, note_count, duration_bars, genres, artist, title, tags)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            rows,
+        )
+
     def index_directory(
         self,
         directory: Path | str,
@@ -341,6 +314,7 @@ class ClipLibrary:
         tags: list[str] | None = None,
         progress_callback: Callable[[int, int, str], bool | None] | None = None,
         error_callback: Callable[[Path, Exception], None] | None = None,
+        workers: int = 1,
     ) -> int:
         """Index all MIDI files in a directory.
 
@@ -353,39 +327,86 @@ class ClipLibrary:
             progress_callback: Optional callback(current, total, filename).
                 Returns False to cancel, True or None to continue.
             error_callback: Optional callback(file_path, exception) for errors.
+            workers: Number of processes used to parse and analyze files.
+                Database writes always happen in this process.
 
         Returns:
             Number of clips indexed.
         """
-        directory = Path(directory)
-        pattern = "**/*.mid" if recursive else "*.mid"
+        files: Iterable[Path] = iter_midi_files(directory, recursive=recursive)
+        total = 0
+        if progress_callback:
+            # Progress is reported against a total, so list the tree first;
+            # otherwise files are indexed while the walk is still running
+            files = list(files)
+            total = len(files)
 
-        files = list(directory.glob(pattern))
-        files.extend(directory.glob(pattern.replace(".mid", ".midi")))
+        analyze = functools.partial(_index_file, genres=genres, artist=artist, tags=tags)
 
         total_clips = 0
-        for i, file_path in enumerate(files):
+        # Rows are written in batches rather than once per file
+        pending: list[tuple] = []
+        with contextlib.ExitStack() as stack:
+            if workers > 1:
+                executor = stack.enter_context(ProcessPoolExecutor(max_workers=workers))
+                # Drop queued files rather than finishing them on cancel
+                stack.callback(executor.shutdown, cancel_futures=True)
+                results = _submit_in_order(executor, analyze, files, window=workers * 4)
+            else:
+                results = ((f, functools.partial(analyze, f)) for f in files)
+
             try:
-                clips = self.index_file(
-                    file_path,
-                    genres=genres,
-                    artist=artist,
-                    tags=tags,
-                )
-                total_clips += len(clips)
-
-                if progress_callback:
-                    result = progress_callback(i + 1, len(files), file_path.name)
-                    if result is False:  # Explicitly check for False to allow None
-                        break  # User cancelled
-            except Exception as e:
-                # Report error if callback provided, otherwise skip silently
-                if error_callback:
-                    error_callback(file_path, e)
-                continue
+                for i, (file_path, result_of) in enumerate(results):
+                    try:
+                        clips, rows = result_of()
+                        total_clips += len(clips)
+                        pending.extend(rows)
+                        if len(pending) >= self.INSERT_BATCH_SIZE:
+                            self._insert_rows(pending)
+                            self.connection.commit()
+                            pending.clear()
+
+                        if progress_callback:
+                            result = progress_callback(i + 1, total, file_path.name)
+                            if result is False:  # Explicitly check for False to allow None
+                                break  # User cancelled
+                    except Exception as e:
+                        # Report error if callback provided, otherwise skip silently
+                        if error_callback:
+                            error_callback(file_path, e)
+                        continue
+            finally:
+                self._insert_rows(pending)
+                self.connection.commit()
 
         return total_clips
 
+    def merge_from(self, db_path: Path | str) -> int:
+        """Copy every clip from another library database.
+
+        The clips are added in a single transaction, so readers see either
+        none or all of them. Clips with the same ID are replaced.
+
+        Args:
+            db_path: Path to the library database to copy from.
+
+        Returns:
+            Number of clips copied.
+        """
+        columns = (
+            "clip_id, song_id, track_id, source_path, track_name, role, channel, "
+            "note_count, duration_bars, genres, artist, title, tags, created_at"
+        )
+        self.connection.execute("ATTACH DATABASE ? AS source", (str(db_path),))
+        try:
+            with self.connection:
+                cursor = self.connection.execute(
+                    f"INSERT OR REPLACE INTO clips ({columns}) SELECT {columns} FROM source.clips"
+                )
+            return cursor.rowcount
+        finally:
+            self.connection.execute("DETACH DATABASE source")
+
     def query(self, query: ClipQuery) -> list[ClipInfo]:
         """Query clips matching the given criteria.
 
@@ -395,6 +416,20 @@ class ClipLibrary:
         Returns:
             List of matching clips.
         """
+        return list(self.iter_query(query))
+
+    def iter_query(self, query: ClipQuery) -> Iterator[ClipInfo]:
+        """Query clips matching the given criteria, one row at a time.
+
+        Rows are converted as they are read from the cursor, so the first
+        clip is available before the rest of the result is fetched.
+
+        Args:
+            query: Query parameters.
+
+        Yields:
+            Matching clips.
+        """
         cursor = self.connection.cursor()
 
         sql = "SELECT * FROM clips WHERE 1=1"
@@ -446,9 +481,8 @@ class ClipLibrary:
         params.extend([query.limit, query.offset])
 
         cursor.execute(sql, params)
-        rows = cursor.fetchall()
-
-        return [self._row_to_clip(row) for row in rows]
+        for row in cursor:
+            yield self._row_to_clip(row)
 
     def query_by_role(self, role: TrackRole, limit: int = 100) -> list[ClipInfo]:
         """Shortcut to query clips by role.
@@ -486,6 +520,20 @@ class ClipLibrary:
         """
         return self.query(ClipQuery(artist=artist, limit=limit))
 
+    def get_clip(self, clip_id: str) -> ClipInfo | None:
+        """Look up a clip by ID.
+
+        Args:
+            clip_id: ID of the clip.
+
+        Returns:
+            The clip, or None if not found.
+        """
+        row = self.connection.execute(
+            "SELECT * FROM clips WHERE clip_id = ?", (clip_id,)
+        ).fetchone()
+        return self._row_to_clip(row) if row else None
+
     def load_track(self, clip: ClipInfo) -> Track:
         """Load the actual track data for a clip.
 
@@ -523,44 +571,52 @@ class ClipLibrary:
         cursor = self.connection.cursor()
 
         # Total counts
-        cursor.execute("SELECT COUNT(*) FROM clips")
-        total_clips = cursor.fetchone()[0]
-
-        cursor.execute("SELECT COUNT(DISTINCT song_id) FROM clips")
-        total_songs = cursor.fetchone()[0]
+        cursor.execute("SELECT COUNT(*), COUNT(DISTINCT song_id) FROM clips")
+        total_clips, total_songs = cursor.fetchone()
 
         # Clips by role
         cursor.execute("SELECT role, COUNT(*) FROM clips GROUP BY role")
         clips_by_role = dict(cursor.fetchall())
 
-        # Clips by genre (need to parse JSON)
-        cursor.execute("SELECT genres FROM clips WHERE genres IS NOT NULL")
-        genre_counts: dict[str, int] = {}
-        for (genres_json,) in cursor.fetchall():
-            genres = json.loads(genres_json) if genres_json else []
-            for genre in genres:
-                genre_counts[genre] = genre_counts.get(genre, 0) + 1
-
-        # Unique artists
-        cursor.execute("SELECT DISTINCT artist FROM clips WHERE artist != ''")
-        artists = [row[0] for row in cursor.fetchall()]
-
         return IndexStats(
             total_clips=total_clips,
             total_songs=total_songs,
             clips_by_role=clips_by_role,
-            clips_by_genre=genre_counts,
-            artists=sorted(artists),
+            clips_by_genre=self._genre_counts(),
+            artists=self.list_artists(),
         )
 
+    def _genre_counts(self) -> dict[str, int]:
+        """Count clips per genre, most common first."""
+        try:
+            # Expand the genres JSON arrays and group inside SQLite
+            rows = self.connection.execute("""
+                SELECT genre.value, COUNT(*) AS n
+                FROM clips, json_each(clips.genres) AS genre
+                WHERE clips.genres != ''
+                GROUP BY genre.value
+                ORDER BY n DESC, genre.value
+            """).fetchall()
+            return dict(rows)
+        except sqlite3.OperationalError:
+            # SQLite built without JSON support
+            pass
+
+        genre_counts: dict[str, int] = {}
+        for (genres_json,) in self.connection.execute(
+            "SELECT genres FROM clips WHERE genres IS NOT NULL"
+        ):
+            for genre in json.loads(genres_json) if genres_json else []:
+                genre_counts[genre] = genre_counts.get(genre, 0) + 1
+        return dict(sorted(genre_counts.items(), key=lambda item: (-item[1], item[0])))
+
     def list_genres(self) -> list[str]:
         """List all genres in the library.
 
         Returns:
             Sorted list of genres.
         """
-        stats = self.get_stats()
-        return sorted(stats.clips_by_genre.keys())
+        return sorted(self._genre_counts())
 
     def list_artists(self) -> list[str]:
         """List all artists in the library.
@@ -682,13 +738,130 @@ class ClipLibrary:
         Yields:
             ClipInfo objects.
         """
-        offset = 0
-        while True:
-            clips = self.query(ClipQuery(limit=batch_size, offset=offset))
-            if not clips:
-                break
-            yield from clips
-            offset += batch_size
+        # One cursor read in batches, rather than re-running the query with
+        # a growing OFFSET that rescans every earlier row
+        cursor = self.connection.execute("SELECT * FROM clips ORDER BY note_count DESC")
+        while rows := cursor.fetchmany(batch_size):
+            for row in rows:
+                yield self._row_to_clip(row)
+
+
+def _index_file(
+    file_path: Path | str,
+    *,
+    genres: list[str] | None = None,
+    artist: str = "",
+    title: str = "",
+    tags: list[str] | None = None,
+) -> tuple[list[ClipInfo], list[tuple]]:
+    """Analyze a single MIDI file into clips, without writing them.
+
+    A module-level function so it can run in a worker process. See
+    ClipLibrary.index_file for arguments.
+
+    Returns:
+        The clips, and their database rows for _insert_rows.
+    """
+    file_path = Path(file_path)
+    song = parse_midi_file(file_path)
+
+    # Extract metadata from filename/path if not provided
+    extractor = MetadataExtractor()
+    metadata = extractor.extract(file_path)
+    if not artist:
+        artist = metadata.artist or ""
+    if not title:
+        title = metadata.title or ""
+
+    # Normalize genres
+    normalized_genres = []
+    if genres:
+        for g in genres:
+            canonical = normalize_tag(g)
+            if canonical and canonical not in normalized_genres:
+                normalized_genres.append(canonical)
+
+    clips = []
+    feature_extractor = FeatureExtractor()
+
+    # Extract features, then classify all track roles together
+    tracks = [track for track in song.tracks if track.notes]
+    for track in tracks:
+        track.features = feature_extractor.extract_features(track, song.total_bars or 1)
+
+    source_path = str(file_path.resolve())
+    genres_json = json.dumps(normalized_genres)
+    tags_json = json.dumps(tags or [])
+    rows = []
+    for track, role_probs in zip(tracks, classify_track_roles(tracks), strict=True):
+        role = role_probs.primary_role()
+
+        # Generate clip ID
+        clip_id = f"{song.song_id}_{track.track_id}"
+
+        clip = ClipInfo(
+            clip_id=clip_id,
+            song_id=song.song_id,
+            track_id=track.track_id,
+            source_path=source_path,
+            track_name=track.name,
+            role=role,
+            channel=track.channel,
+            note_count=len(track.notes),
+            duration_bars=song.total_bars,
+            genres=normalized_genres,
+            artist=artist,
+            title=title,
+            tags=tags or [],
+        )
+
+        rows.append((
+            clip.clip_id,
+            clip.song_id,
+            clip.track_id,
+            clip.source_path,
+            clip.track_name,
+            clip.role.value,
+            clip.channel,
+            clip.note_count,
+            clip.duration_bars,
+            genres_json,
+            clip.artist,
+            clip.title,
+            tags_json,
+        ))
+        clips.append(clip)
+
+    return clips, rows
+
+
+def _submit_in_order(
+    executor: Executor,
+    fn: Callable[[Path], _T],
+    items: Iterable[Path],
+    window: int,
+) -> Iterator[tuple[Path, Callable[[], _T]]]:
+    """Submit fn over items with a bounded number of calls in flight.
+
+    Args:
+        executor: Executor to run on.
+        fn: Function to apply.
+        items: Inputs, consumed as results are taken.
+        window: Maximum number of pending submissions.
+
+    Yields:
+        Each item with a callable returning its result (or raising its
+        error), in input order.
+    """
+    pending: deque[tuple[Path, Future[_T]]] = deque()
+    for item in items:
+        pending.append((item, executor.submit(fn, item)))
+        if len(pending) >= window:
+            done, future = pending.popleft()
+            yield done, future.result
+    while pending:
+        done, future = pending.popleft()
+        yield done, future.result
 
 
 __all__ = [
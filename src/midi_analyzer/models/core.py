@@ -4,7 +4,10 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import numpy as np
 
 
 class TrackRole(str, Enum):
@@ -19,7 +22,7 @@ class TrackRole(str, Enum):
     OTHER = "other"
 
 
-@dataclass
+@dataclass(slots=True)
 class RoleProbabilities:
     """Probability distribution over track roles."""
 
@@ -129,7 +132,7 @@ class TimeSignature:
         return self.numerator * (4 / self.denominator)
 
 
-@dataclass
+@dataclass(slots=True)
 class TrackFeatures:
     """Computed features for a track.
 
@@ -201,6 +204,40 @@ class Track:
     notes: list[NoteEvent] = field(default_factory=list)
     features: TrackFeatures | None = None
     role_probs: RoleProbabilities | None = None
+    _note_arrays_cache: tuple[int, int, dict[str, np.ndarray]] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    @property
+    def note_arrays(self) -> dict[str, np.ndarray]:
+        """Get per-field NumPy arrays of the track's notes.
+
+        Keys are "pitch", "velocity", "start_beat", "duration_beats",
+        "channel" and "bar". The arrays are built on first access and
+        rebuilt if the notes list is replaced or changes length.
+        """
+        notes = self.notes
+        cache = self._note_arrays_cache
+        if cache is not None and cache[0] == id(notes) and cache[1] == len(notes):
+            return cache[2]
+
+        import numpy as np
+
+        count = len(notes)
+        arrays: dict[str, np.ndarray] = {
+            "pitch": np.fromiter((n.pitch for n in notes), dtype=np.int16, count=count),
+            "velocity": np.fromiter((n.velocity for n in notes), dtype=np.int8, count=count),
+            "start_beat": np.fromiter(
+                (n.start_beat for n in notes), dtype=np.float64, count=count
+            ),
+            "duration_beats": np.fromiter(
+                (n.duration_beats for n in notes), dtype=np.float64, count=count
+            ),
+            "channel": np.fromiter((n.channel for n in notes), dtype=np.int8, count=count),
+            "bar": np.fromiter((n.bar for n in notes), dtype=np.int32, count=count),
+        }
+        self._note_arrays_cache = (id(notes), count, arrays)
+        return arrays
 
     @property
     def primary_role(self) -> TrackRole:
@@ -10,6 +10,8 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import TYPE_CHECKING, Callable
 
+from midi_analyzer.ingest.files import MIDI_EXTENSIONS, iter_midi_files
+
 if TYPE_CHECKING:
     from midi_analyzer.models.core import Song
 
@@ -415,7 +417,7 @@ class BatchProcessor:
         directory: Path,
         config: BatchConfig | None = None,
         recursive: bool = True,
-        extensions: tuple[str, ...] = (".mid", ".midi"),
+        extensions: tuple[str, ...] = MIDI_EXTENSIONS,
     ) -> list[ProcessingResult]:
         """Process all MIDI files in a directory.
 
@@ -428,18 +430,8 @@ class BatchProcessor:
         Returns:
             List of processing results.
         """
-        # Find all MIDI files
-        files: list[Path] = []
-
-        if recursive:
-            for ext in extensions:
-                files.extend(directory.rglob(f"*{ext}"))
-        else:
-            for ext in extensions:
-                files.extend(directory.glob(f"*{ext}"))
-
-        # Sort for consistent ordering
-        files = sorted(set(files))
+        # Find all MIDI files, sorted for consistent ordering
+        files = sorted(iter_midi_files(directory, recursive=recursive, extensions=extensions))
 
         # Set up checkpoint in directory
         checkpoint_path = directory / ".midi_analyzer_checkpoint"
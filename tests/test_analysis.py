@@ -4,7 +4,7 @@ import pytest
 
 from midi_analyzer.models.core import NoteEvent, Track, TrackFeatures, TrackRole
 from midi_analyzer.analysis.features import FeatureExtractor, extract_track_features
-from midi_analyzer.analysis.roles import RoleClassifier, classify_track_role
+from midi_analyzer.analysis.roles import RoleClassifier, classify_track_role, classify_track_roles
 
 
 class TestFeatureExtractor:
@@ -65,6 +65,18 @@ class TestFeatureExtractor:
 
         assert features.polyphony_ratio == 0.0
 
+    def test_partial_polyphony(self) -> None:
+        """Test polyphony ratio for notes that overlap part of the time."""
+        # Two notes share one beat out of three sounding beats
+        notes = [
+            NoteEvent(pitch=60, velocity=100, start_beat=0.0, duration_beats=2.0, track_id=0, channel=0, bar=0),
+            NoteEvent(pitch=64, velocity=100, start_beat=1.0, duration_beats=2.0, track_id=0, channel=0, bar=0),
+        ]
+        track = Track(track_id=0, notes=notes)
+        features = extract_track_features(track, total_bars=1)
+
+        assert features.polyphony_ratio == pytest.approx(1 / 3)
+
     def test_drum_channel_detection(self) -> None:
         """Test channel 10 detection for drums."""
         notes = [
@@ -137,6 +149,25 @@ class TestRoleClassifier:
         assert probs.primary_role() == TrackRole.DRUMS
         assert probs.drums > 0.5
 
+    def test_drum_channel_scores_only_drums(self) -> None:
+        """Test that channel 10 tracks get no melodic role probability."""
+        features = TrackFeatures(
+            note_count=32,
+            note_density=4.0,
+            polyphony_ratio=0.05,
+            pitch_min=28,
+            pitch_max=48,
+            pitch_median=38.0,
+            pitch_range=20,
+            avg_velocity=90.0,
+            avg_duration=0.5,
+            is_channel_10=True,
+        )
+        probs = classify_track_role(Track(track_id=0, features=features))
+
+        assert probs.drums == 1.0
+        assert probs.bass == 0.0
+
     def test_bass_classification(self) -> None:
         """Test bass track classification."""
         features = TrackFeatures(
@@ -259,3 +290,45 @@ class TestRoleClassifier:
 
         assert probs.primary_role() == TrackRole.OTHER
         assert probs.other == 1.0
+
+    @pytest.mark.parametrize("batch_min_tracks", [0, 1000])
+    def test_batch_matches_single(
+        self, batch_min_tracks: int, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that batch classification matches per-track classification."""
+        monkeypatch.setattr(RoleClassifier, "BATCH_MIN_TRACKS", batch_min_tracks)
+        tracks = [
+            Track(
+                track_id=i,
+                features=TrackFeatures(
+                    note_count=32,
+                    note_density=density,
+                    polyphony_ratio=polyphony,
+                    pitch_min=36,
+                    pitch_max=36 + pitch_range,
+                    pitch_median=36 + pitch_range / 2,
+                    pitch_range=pitch_range,
+                    avg_velocity=90.0,
+                    avg_duration=duration,
+                    syncopation_score=0.3,
+                    repetition_score=0.6,
+                    is_channel_10=i == 0,
+                    pitch_class_entropy=0.4,
+                ),
+            )
+            for i, (density, polyphony, pitch_range, duration) in enumerate([
+                (16.0, 0.1, 15, 0.1),
+                (4.0, 0.05, 20, 0.5),
+                (6.0, 0.6, 24, 1.0),
+                (1.0, 0.5, 48, 4.0),
+                (16.0, 0.1, 36, 0.125),
+            ])
+        ]
+        tracks.append(Track(track_id=5, features=None))
+
+        classifier = RoleClassifier()
+        batch = classify_track_roles(tracks)
+        single = [classifier.classify(t) for t in tracks]
+        for b, s in zip(batch, single, strict=True):
+            assert b.to_dict() == pytest.approx(s.to_dict())
+            assert b.primary_role() == s.primary_role()
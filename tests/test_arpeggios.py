@@ -141,6 +141,20 @@ class TestArpAnalyzer:
         # Root should be A (9)
         assert window.inferred_chord.root == 9
 
+    def test_inferred_chords_not_shared(self) -> None:
+        """Test that windows with the same pitch classes get separate chords."""
+        notes = [make_note(pitch, i * 0.25) for i, pitch in enumerate([60, 64, 67] * 8)]
+        track = Track(track_id=0, notes=notes)
+
+        analyzer = ArpAnalyzer()
+        first = analyzer.analyze_track(track).windows[0].inferred_chord
+        second = analyzer.analyze_track(track).windows[0].inferred_chord
+
+        assert first is not None and second is not None
+        assert first == second
+        first.confidence = 0.0
+        assert second.confidence > 0.0
+
     def test_gate_calculation(self) -> None:
         """Test gate (sustain ratio) calculation."""
         # Short staccato notes (low gate)
@@ -3,6 +3,8 @@
 import pytest
 
 from midi_analyzer.harmony.chords import (
+    CHORD_TEMPLATE_BITS,
+    CHORD_TEMPLATES,
     Chord,
     ChordEvent,
     ChordProgression,
@@ -493,6 +495,14 @@ class TestChordQuality:
         assert ChordQuality.DIMINISHED.value == "dim"
         assert ChordQuality.AUGMENTED.value == "aug"
 
+    def test_template_bits_match_templates(self):
+        """Test template bitmasks encode the template intervals."""
+        assert len(CHORD_TEMPLATE_BITS) == len(CHORD_TEMPLATES)
+        for quality, bits, size in CHORD_TEMPLATE_BITS:
+            template = CHORD_TEMPLATES[quality]
+            assert {pc for pc in range(12) if bits & (1 << pc)} == template
+            assert size == len(template)
+
 
 class TestChordEvent:
     """Tests for ChordEvent class."""
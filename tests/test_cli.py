@@ -1,10 +1,19 @@
 """Tests for CLI commands."""
 
+import pytest
 from click.testing import CliRunner
 
 from midi_analyzer.cli.main import cli
 
 
+@pytest.fixture(autouse=True)
+def song_cache(tmp_path, monkeypatch):
+    """Keep the parsed song cache out of the user's home directory."""
+    cache_home = tmp_path / "cache"
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    return cache_home / "midi-analyzer" / "songs"
+
+
 class TestCLI:
     """Tests for the CLI interface."""
 
@@ -48,3 +57,176 @@ class TestCLI:
         runner = CliRunner()
         result = runner.invoke(cli, ["analyze", "/nonexistent/path"])
         assert result.exit_code != 0
+
+    def test_analyze_empty_directory(self, tmp_path) -> None:
+        """Test analyze with a directory containing no MIDI files."""
+        runner = CliRunner()
+        result = runner.invoke(cli, ["analyze", str(tmp_path)])
+        assert result.exit_code == 1
+        assert "No MIDI files found" in result.output
+
+    def test_analyze_serial_directory(self, tmp_path) -> None:
+        """Test analyze -j 1 over a directory with a valid and a broken file."""
+        import mido
+
+        midi = mido.MidiFile()
+        track = mido.MidiTrack()
+        for pitch in (60, 64, 67):
+            track.append(mido.Message("note_on", note=pitch, velocity=100, time=0))
+            track.append(mido.Message("note_off", note=pitch, velocity=0, time=480))
+        midi.tracks.append(track)
+        midi.save(tmp_path / "a.mid")
+        (tmp_path / "b.mid").write_bytes(b"not midi")
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["analyze", "-j", "1", str(tmp_path)])
+        assert result.exit_code == 0
+        assert "a.mid" in result.output
+        assert "Processed 1/2 files successfully" in result.output
+        assert "b.mid" in result.output
+
+    def test_analyze_song_cache(self, tmp_path, song_cache) -> None:
+        """Test that a repeated analyze loads files from the song cache."""
+        import mido
+
+        midi = mido.MidiFile()
+        track = mido.MidiTrack()
+        track.append(mido.Message("note_on", note=60, velocity=100, time=0))
+        track.append(mido.Message("note_off", note=60, velocity=0, time=480))
+        midi.tracks.append(track)
+        midi.save(tmp_path / "a.mid")
+
+        runner = CliRunner()
+        args = ["-v", "analyze", str(tmp_path / "a.mid")]
+        assert "Loaded 0/1 files" in runner.invoke(cli, args).output
+        assert "Loaded 1/1 files" in runner.invoke(cli, args).output
+        assert len(list(song_cache.glob("*.pkl"))) == 1
+
+        result = runner.invoke(cli, ["--no-cache", *args])
+        assert result.exit_code == 0
+        assert "song cache" not in result.output
+
+    def test_analyze_drum_hits_keep_first_seen_order(self, tmp_path) -> None:
+        """Test that drum hits with equal counts are listed in order of first hit."""
+        import mido
+
+        midi = mido.MidiFile()
+        track = mido.MidiTrack()
+        for pitch in (42, 38, 36, 49) * 4:
+            track.append(mido.Message("note_on", channel=9, note=pitch, velocity=100, time=0))
+            track.append(mido.Message("note_off", channel=9, note=pitch, velocity=0, time=120))
+        midi.tracks.append(track)
+        midi.save(tmp_path / "beat.mid")
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["analyze", "-v", str(tmp_path / "beat.mid")])
+        assert result.exit_code == 0, result.output
+        assert "Top hits: hihat-c:4, snare:4, kick:4" in result.output
+
+    def test_to_json_matches_stdlib(self, monkeypatch) -> None:
+        """Test that JSON output parses the same with and without orjson."""
+        import json
+        import sys
+
+        from midi_analyzer.cli.main import _to_json
+
+        data = {
+            "notes": [{"pitch": 60, "start_beat": 0.5, "velocity_var": 1e-05}],
+            "genres": [],
+            "name": "Café",
+            "length": 1e16,
+        }
+        assert json.loads(_to_json(data)) == data
+        monkeypatch.setitem(sys.modules, "orjson", None)
+        assert _to_json(data) == json.dumps(data, indent=2)
+
+    def test_export_json_file_is_utf8(self, tmp_path) -> None:
+        """Test that clips with non-ASCII names export to a UTF-8 JSON file."""
+        import json
+
+        import mido
+
+        from midi_analyzer.library import ClipLibrary
+
+        midi = mido.MidiFile()
+        track = mido.MidiTrack()
+        track.append(mido.MetaMessage("track_name", name="Café", time=0))
+        for pitch in (36, 40, 43):
+            track.append(mido.Message("note_on", note=pitch, velocity=100, time=0))
+            track.append(mido.Message("note_off", note=pitch, velocity=0, time=480))
+        midi.tracks.append(track)
+        midi.save(tmp_path / "song.mid")
+
+        db_path = tmp_path / "lib.db"
+        with ClipLibrary(db_path) as library:
+            (clip,) = library.index_file(tmp_path / "song.mid")
+
+        output = tmp_path / "clip.json"
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            ["export", clip.clip_id, "-f", "json", "-o", str(output), "-d", str(db_path)],
+        )
+        assert result.exit_code == 0, result.output
+        data = json.loads(output.read_text(encoding="utf-8"))
+        assert clip.track_name == "Café"
+        assert data["track_name"] == "Café"
+
+    def test_arpeggios_drum_track(self, tmp_path) -> None:
+        """Test that drum tracks are only analyzed as arps when requested."""
+        import mido
+
+        midi = mido.MidiFile()
+        track = mido.MidiTrack()
+        for pitch in (36, 38, 42, 36) * 4:
+            track.append(mido.Message("note_on", channel=9, note=pitch, velocity=100, time=0))
+            track.append(mido.Message("note_off", channel=9, note=pitch, velocity=0, time=120))
+        midi.tracks.append(track)
+        midi.save(tmp_path / "beat.mid")
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["arpeggios", str(tmp_path / "beat.mid")])
+        assert result.exit_code == 1
+        assert "No arpeggio-like tracks detected" in result.output
+
+        result = runner.invoke(
+            cli, ["arpeggios", "--track", "0", "--format", "json", str(tmp_path / "beat.mid")]
+        )
+        assert result.exit_code == 0, result.output
+        assert '"track_index": 0' in result.output
+
+    def test_play_file_labels_track_roles(self, tmp_path, monkeypatch) -> None:
+        """Test that play classifies each track before playing it."""
+        import mido
+
+        import midi_analyzer.player as player_module
+
+        played = []
+
+        class FakePlayer:
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *args):
+                pass
+
+            def play_track(self, track, _options):
+                played.append(track)
+
+        monkeypatch.setattr(player_module, "MidiPlayer", FakePlayer)
+
+        midi = mido.MidiFile()
+        track = mido.MidiTrack()
+        for pitch in (36, 38, 42, 36):
+            track.append(mido.Message("note_on", channel=9, note=pitch, velocity=100, time=0))
+            track.append(mido.Message("note_off", channel=9, note=pitch, velocity=0, time=240))
+        midi.tracks.append(track)
+        midi.save(tmp_path / "beat.mid")
+        db_path = tmp_path / "lib.db"
+        db_path.touch()
+
+        runner = CliRunner()
+        result = runner.invoke(cli, ["play", "-d", str(db_path), str(tmp_path / "beat.mid")])
+        assert result.exit_code == 0, result.output
+        assert "[drums] -> Drums" in result.output
+        assert len(played) == 1
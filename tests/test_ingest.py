@@ -6,10 +6,11 @@ import tempfile
 import mido
 import pytest
 
+from midi_analyzer.ingest.files import iter_midi_files
 from midi_analyzer.ingest.parser import MidiParser, parse_midi
 from midi_analyzer.ingest.timing import TimingResolver, quantize_song
 from midi_analyzer.ingest.metadata import MetadataExtractor, extract_metadata
-from midi_analyzer.models.core import TempoEvent, TimeSignature
+from midi_analyzer.models.core import Song, TempoEvent, TimeSignature
 
 
 class TestMidiParser:
@@ -299,3 +300,149 @@ class TestMetadataExtractor:
 
         assert metadata.title  # Should have some title
         assert metadata.source == "filename_fallback" or metadata.source == "filename_hyphenated"
+
+
+class TestMidiFileDiscovery:
+    """Tests for MIDI file discovery."""
+
+    def test_iter_midi_files(self, tmp_path: Path) -> None:
+        """Test matching both extensions, with and without recursion."""
+        (tmp_path / "a.mid").touch()
+        (tmp_path / "b.midi").touch()
+        (tmp_path / "C.MID").touch()
+        (tmp_path / "notes.txt").touch()
+        (tmp_path / "sub").mkdir()
+        (tmp_path / "sub" / "c.mid").touch()
+        (tmp_path / "dir.mid").mkdir()
+
+        top = sorted(p.name for p in iter_midi_files(tmp_path))
+        assert top == ["C.MID", "a.mid", "b.midi"]
+
+        nested = sorted(p.relative_to(tmp_path) for p in iter_midi_files(tmp_path, recursive=True))
+        assert nested == [Path("C.MID"), Path("a.mid"), Path("b.midi"), Path("sub/c.mid")]
+
+    def test_iter_midi_files_missing_directory(self, tmp_path: Path) -> None:
+        """Test that an unreadable directory yields nothing."""
+        assert list(iter_midi_files(tmp_path / "missing")) == []
+
+    def test_iter_midi_files_path_fallback(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the path-based walk finds the same files as the fd walk."""
+        from midi_analyzer.ingest import files
+
+        (tmp_path / "a.mid").touch()
+        (tmp_path / "sub" / "deep").mkdir(parents=True)
+        (tmp_path / "sub" / "deep" / "b.midi").touch()
+
+        by_fd = sorted(iter_midi_files(tmp_path, recursive=True))
+        monkeypatch.setattr(files, "_HAS_DIR_FD", False)
+        by_path = sorted(iter_midi_files(tmp_path, recursive=True))
+        assert by_fd == by_path == [tmp_path / "a.mid", tmp_path / "sub" / "deep" / "b.midi"]
+
+
+class TestSongCache:
+    """Tests for the parsed song cache."""
+
+    def test_cached_parse(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a second parse of an unchanged file comes from the cache."""
+        from midi_analyzer.ingest.cache import parse_midi_file_cached
+
+        midi = mido.MidiFile()
+        track = mido.MidiTrack()
+        track.append(mido.Message("note_on", note=60, velocity=100, time=0))
+        track.append(mido.Message("note_off", note=60, velocity=0, time=480))
+        midi.tracks.append(track)
+        path = tmp_path / "song.mid"
+        midi.save(path)
+        cache_dir = tmp_path / "cache"
+
+        song = parse_midi_file_cached(path, cache_dir)
+        assert len(list(cache_dir.glob("*.pkl"))) == 1
+
+        def fail(*_args: object) -> None:
+            raise AssertionError("parsed again")
+
+        monkeypatch.setattr(MidiParser, "parse_file", fail)
+        cached = parse_midi_file_cached(path, cache_dir)
+        assert cached.song_id == song.song_id
+        assert [n.pitch for n in cached.tracks[0].notes] == [60]
+
+        # A changed file misses the cache
+        track.append(mido.Message("note_on", note=62, velocity=100, time=0))
+        midi.save(path)
+        with pytest.raises(AssertionError, match="parsed again"):
+            parse_midi_file_cached(path, cache_dir)
+
+    def test_cache_write_failure(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that a song that cannot be pickled is still returned."""
+        import pickle
+
+        from midi_analyzer.ingest.cache import parse_midi_file_cached
+
+        midi = mido.MidiFile()
+        midi.tracks.append(mido.MidiTrack())
+        path = tmp_path / "song.mid"
+        midi.save(path)
+        cache_dir = tmp_path / "cache"
+
+        def fail(*_args: object, **_kwargs: object) -> None:
+            raise pickle.PicklingError("unpicklable")
+
+        monkeypatch.setattr(pickle, "dump", fail)
+        song = parse_midi_file_cached(path, cache_dir)
+        assert isinstance(song, Song)
+        assert list(cache_dir.iterdir()) == []
+
+    def test_cache_is_bounded(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the least recently used entries are pruned."""
+        import os
+
+        from midi_analyzer.ingest import cache
+
+        monkeypatch.setattr(cache, "MAX_CACHE_ENTRIES", 2)
+        monkeypatch.setattr(cache, "PRUNE_INTERVAL", 1)
+        cache_dir = tmp_path / "cache"
+        paths = []
+        for i in range(3):
+            midi = mido.MidiFile()
+            track = mido.MidiTrack()
+            track.append(mido.Message("note_on", note=60 + i, velocity=100, time=0))
+            track.append(mido.Message("note_off", note=60 + i, velocity=0, time=480))
+            midi.tracks.append(track)
+            paths.append(tmp_path / f"song{i}.mid")
+            midi.save(paths[-1])
+
+        cache.load_song(paths[0], cache_dir)
+        cache.load_song(paths[1], cache_dir)
+        # Age both entries, then use the first again so the second is oldest
+        for entry in cache_dir.glob("*.pkl"):
+            os.utime(entry, ns=(0, 0))
+        assert cache.load_song(paths[0], cache_dir)[1]
+
+        cache.load_song(paths[2], cache_dir)
+        assert len(list(cache_dir.glob("*.pkl"))) == 2
+        assert cache.load_song(paths[0], cache_dir)[1]
+        assert not cache.load_song(paths[1], cache_dir)[1]
+
+    def test_cache_prunes_periodically(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+        """Test that the entry count is only checked every PRUNE_INTERVAL writes."""
+        import itertools
+
+        from midi_analyzer.ingest import cache
+
+        monkeypatch.setattr(cache, "MAX_CACHE_ENTRIES", 1)
+        monkeypatch.setattr(cache, "PRUNE_INTERVAL", 3)
+        monkeypatch.setattr(cache, "_writes", itertools.count())
+        cache_dir = tmp_path / "cache"
+        for i in range(4):
+            midi = mido.MidiFile()
+            track = mido.MidiTrack()
+            track.append(mido.Message("note_on", note=60 + i, velocity=100, time=0))
+            track.append(mido.Message("note_off", note=60 + i, velocity=0, time=480))
+            midi.tracks.append(track)
+            path = tmp_path / f"song{i}.mid"
+            midi.save(path)
+            cache.load_song(path, cache_dir)
+            if i == 2:
+                assert len(list(cache_dir.glob("*.pkl"))) == 3
+
+        assert len(list(cache_dir.glob("*.pkl"))) == 1
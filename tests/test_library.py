@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import sqlite3
 import tempfile
 from pathlib import Path
 
@@ -40,6 +41,78 @@ class TestClipLibrary:
             assert library.connection is not None
         # Connection should be closed after context exit
 
+    def test_read_only(self, temp_db: Path):
+        """Test opening an existing library read-only."""
+        with ClipLibrary(temp_db) as library:
+            library.connection.execute(
+                """INSERT INTO clips (clip_id, song_id, track_id, source_path, role,
+                   channel, note_count, duration_bars) VALUES ('s_0', 's', 0, 'x.mid', 'bass', 0, 4, 1)"""
+            )
+            library.connection.commit()
+
+        with ClipLibrary(temp_db, read_only=True) as library:
+            assert library.get_stats().total_clips == 1
+            with pytest.raises(sqlite3.OperationalError):
+                library.delete_clip("s_0")
+
+    def test_role_query_uses_index(self, library: ClipLibrary):
+        """Test that role queries are served in note_count order by an index."""
+        plan = library.connection.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM clips WHERE role = ? ORDER BY note_count DESC",
+            ("bass",),
+        ).fetchall()
+        details = " ".join(row[3] for row in plan)
+        assert "idx_clips_role_notes" in details
+        assert "TEMP B-TREE" not in details
+
+    def test_iter_query_and_clips(self, library: ClipLibrary):
+        """Test streaming query results and batched iteration."""
+        for i, notes in enumerate((5, 9, 7)):
+            library.connection.execute(
+                """INSERT INTO clips (clip_id, song_id, track_id, source_path, role,
+                   channel, note_count, duration_bars) VALUES (?, 's', ?, 'x.mid', 'bass', 0, ?, 1)""",
+                (f"s_{i}", i, notes),
+            )
+        expected = ["s_1", "s_2", "s_0"]
+        assert [c.clip_id for c in library.iter_query(ClipQuery())] == expected
+        assert [c.clip_id for c in library.query(ClipQuery(limit=2))] == expected[:2]
+        assert [c.clip_id for c in library.iter_clips(batch_size=2)] == expected
+
+    def test_get_stats_genres(self, library: ClipLibrary):
+        """Test genre and artist aggregation in stats."""
+        rows = [
+            ("s_0", '["rock", "jazz"]', "B"),
+            ("s_1", '["jazz"]', "A"),
+            ("s_2", "[]", ""),
+            ("s_3", None, "A"),
+        ]
+        for i, (clip_id, genres, artist) in enumerate(rows):
+            library.connection.execute(
+                """INSERT INTO clips (clip_id, song_id, track_id, source_path, role,
+                   channel, note_count, duration_bars, genres, artist)
+                   VALUES (?, 's', ?, 'x.mid', 'bass', 0, 4, 1, ?, ?)""",
+                (clip_id, i, genres, artist),
+            )
+
+        stats = library.get_stats()
+        assert stats.total_clips == 4
+        assert stats.total_songs == 1
+        assert list(stats.clips_by_genre.items()) == [("jazz", 2), ("rock", 1)]
+        assert stats.artists == ["A", "B"]
+        assert library.list_genres() == ["jazz", "rock"]
+
+    def test_get_clip(self, library: ClipLibrary):
+        """Test looking up a clip by ID."""
+        library.connection.execute(
+            """INSERT INTO clips (clip_id, song_id, track_id, source_path, role,
+               channel, note_count, duration_bars) VALUES ('s_0', 's', 0, 'x.mid', 'bass', 0, 4, 1)"""
+        )
+        clip = library.get_clip("s_0")
+        assert clip is not None
+        assert clip.role == TrackRole.BASS
+        assert clip.note_count == 4
+        assert library.get_clip("missing") is None
+
     def test_get_stats_empty(self, library: ClipLibrary):
         """Test stats on empty library."""
         stats = library.get_stats()
@@ -317,3 +390,76 @@ class TestGenreNormalization:
             assert isinstance(clips1, list)
             assert isinstance(clips2, list)
             assert isinstance(clips3, list)
+
+
+class TestLibraryIndexing:
+    """Tests for indexing MIDI files."""
+
+    @staticmethod
+    def _write_midi(path: Path) -> None:
+        """Write a one-track MIDI file with a few notes."""
+        import mido
+
+        midi = mido.MidiFile()
+        track = mido.MidiTrack()
+        for pitch in (36, 40, 43):
+            track.append(mido.Message("note_on", note=pitch, velocity=100, time=0))
+            track.append(mido.Message("note_off", note=pitch, velocity=0, time=480))
+        midi.tracks.append(track)
+        midi.save(path)
+
+    def test_index_directory_batches_commits(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        """Test that batched directory indexing commits every file."""
+        for name in ("a.mid", "b.mid", "c.mid"):
+            self._write_midi(tmp_path / name)
+        (tmp_path / "broken.mid").write_bytes(b"not midi")
+        monkeypatch.setattr(ClipLibrary, "INSERT_BATCH_SIZE", 2)
+
+        db_path = tmp_path / "test.db"
+        errors: list[Path] = []
+        with ClipLibrary(db_path) as library:
+            count = library.index_directory(
+                tmp_path, error_callback=lambda path, _: errors.append(path)
+            )
+
+        assert count == 3
+        assert [p.name for p in errors] == ["broken.mid"]
+        with ClipLibrary(db_path, read_only=True) as library:
+            assert library.get_stats().total_songs == 3
+
+    def test_index_directory_in_workers(self, tmp_path: Path):
+        """Test that indexing with worker processes matches serial indexing."""
+        for name in ("a.mid", "b.mid", "c.mid"):
+            self._write_midi(tmp_path / name)
+        (tmp_path / "broken.mid").write_bytes(b"not midi")
+
+        progress: list[tuple[int, str]] = []
+        errors: list[str] = []
+        with ClipLibrary(tmp_path / "test.db") as library:
+            count = library.index_directory(
+                tmp_path,
+                workers=2,
+                progress_callback=lambda i, _total, name: progress.append((i, name)),
+                error_callback=lambda path, _: errors.append(path.name),
+            )
+            clip_ids = sorted(c.clip_id for c in library.iter_clips())
+
+        with ClipLibrary(tmp_path / "serial.db") as library:
+            assert library.index_directory(tmp_path) == count == 3
+            assert sorted(c.clip_id for c in library.iter_clips()) == clip_ids
+        assert errors == ["broken.mid"]
+        assert sorted(progress) == progress
+
+    def test_merge_from(self, tmp_path: Path):
+        """Test copying clips from a staging library."""
+        self._write_midi(tmp_path / "a.mid")
+        with ClipLibrary(tmp_path / "staging.db") as staging:
+            staging.index_directory(tmp_path)
+            staged = [c.clip_id for c in staging.iter_clips()]
+
+        with ClipLibrary(tmp_path / "main.db") as library:
+            assert library.merge_from(tmp_path / "staging.db") == len(staged) == 1
+            assert [c.clip_id for c in library.iter_clips()] == staged
+            # Merging again replaces rather than duplicates
+            library.merge_from(tmp_path / "staging.db")
+            assert library.get_stats().total_clips == 1
@@ -118,6 +118,26 @@ class TestTrack:
         )
         assert track.primary_role == TrackRole.LEAD
 
+    def test_note_arrays(self) -> None:
+        """Test that note arrays mirror the notes and track list changes."""
+        notes = [
+            NoteEvent(pitch=60, velocity=100, start_beat=0.0, duration_beats=0.5, track_id=0, channel=9, bar=0),
+            NoteEvent(pitch=64, velocity=90, start_beat=4.0, duration_beats=1.0, track_id=0, channel=9, bar=1),
+        ]
+        track = Track(track_id=0, notes=notes)
+
+        arrays = track.note_arrays
+        assert arrays["pitch"].tolist() == [60, 64]
+        assert arrays["velocity"].tolist() == [100, 90]
+        assert arrays["start_beat"].tolist() == [0.0, 4.0]
+        assert arrays["bar"].tolist() == [0, 1]
+        assert track.note_arrays is arrays
+
+        notes.append(
+            NoteEvent(pitch=67, velocity=80, start_beat=8.0, duration_beats=1.0, track_id=0, channel=9, bar=2)
+        )
+        assert track.note_arrays["pitch"].tolist() == [60, 64, 67]
+
 
 class TestSong:
     """Tests for Song."""
@@ -9,6 +9,7 @@ from midi_analyzer.analysis.sections import (
     SectionAnalysis,
     SectionAnalyzer,
     SectionType,
+    _bars_to_matrix,
     analyze_sections,
 )
 from midi_analyzer.models.core import (
@@ -81,7 +82,7 @@ class TestBarFeatures:
             end_beat=4.0,
             active_track_count=4,
             total_note_count=32,
-            density_by_role={"bass": 2.0, "drums": 4.0},
+            role_densities=np.array([2.0, 4.0, 0, 0, 0, 0, 0]),
             harmonic_rhythm=2,
             avg_velocity=100.0,
             pitch_range=24,
@@ -94,6 +95,35 @@ class TestBarFeatures:
         # Should have: track_count, note_count, 7 roles, harmonic_rhythm, 
         # velocity, pitch_range, unique_pitches = 13 values
         assert len(vec) == 13
+        assert features.density_by_role == {"bass": 2.0, "drums": 4.0}
+
+        matrix = np.zeros((2, 13), dtype=np.float32)
+        assert features.to_vector(out=matrix[1]) is not None
+        assert np.array_equal(matrix[1], vec)
+        assert not matrix[0].any()
+
+    def test_bars_to_matrix_matches_vectors(self) -> None:
+        """Test that the batch matrix rows equal to_vector()."""
+        bars = [
+            BarFeatures(bar_number=0, start_beat=0.0, end_beat=4.0),
+            BarFeatures(
+                bar_number=1,
+                start_beat=4.0,
+                end_beat=8.0,
+                active_track_count=3,
+                total_note_count=17,
+                role_densities=np.array([0, 0, 1.25, 0, 0, 0, 0.5]),
+                harmonic_rhythm=1,
+                avg_velocity=87.3,
+                pitch_range=19,
+                unique_pitches=7,
+            ),
+        ]
+
+        matrix = _bars_to_matrix(bars)
+
+        assert matrix.dtype == np.float32
+        assert np.array_equal(matrix, np.stack([b.to_vector() for b in bars]))
 
 
 class TestSection:
@@ -249,6 +279,21 @@ class TestSectionAnalyzer:
         for bf in analysis.bar_features:
             assert "bass" in bf.density_by_role or "drums" in bf.density_by_role
 
+    def test_harmonic_rhythm_from_bass(self) -> None:
+        """Test that bass pitch class changes are counted per bar."""
+        # Bar 0: C C G C (2 changes), bar 1: F F F F (0 changes)
+        pitches = [36, 36, 43, 36, 41, 41, 41, 41]
+        bass_track = Track(
+            track_id=0,
+            notes=[make_note(p, float(i)) for i, p in enumerate(pitches)],
+            role_probs=RoleProbabilities(bass=0.9),
+        )
+        song = make_song(tracks=[bass_track])
+
+        analysis = SectionAnalyzer().analyze_song(song)
+
+        assert [bf.harmonic_rhythm for bf in analysis.bar_features] == [2, 0]
+
     def test_time_signature_handling(self) -> None:
         """Test bar computation with non-4/4 time signature."""
         # 3/4 time: 3 beats per bar
@@ -379,6 +424,20 @@ class TestEdgeCases:
         # Should still compute bar features even if no sections detected
         assert len(analysis.bar_features) >= 1
 
+    def test_short_song_is_single_section(self) -> None:
+        """Test song too short for two minimum-length sections."""
+        # 4 sparse bars then 3 dense bars: a clear change, but only 7 bars
+        notes = [n for bar in range(4) for n in make_sparse_bar(bar)]
+        notes += [n for bar in range(4, 7) for n in make_dense_bar(bar)]
+        song = make_song(tracks=[Track(track_id=0, notes=notes)])
+
+        analysis = SectionAnalyzer(min_section_bars=4).analyze_song(song)
+
+        assert analysis.section_boundaries == [0]
+        assert len(analysis.sections) == 1
+        assert analysis.sections[0].end_bar == 7
+        assert analysis.form_sequence == ["A"]
+
     def test_uniform_content(self) -> None:
         """Test song with uniform content (no clear sections)."""
         # Same density throughout